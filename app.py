@@ -1,20 +1,32 @@
 """ FastAPI로 ASGI app 객체 생성 """
 
 from pathlib import Path
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
 from backend import api, system
+from backend.http import FmpAPI
+from backend.analysis import AnalysisJob
 from backend.integrate import lang_exception_handler
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """프로세스 전역 리소스의 수명 관리"""
+    yield
+    await FmpAPI.close()  # 공유 커넥션 풀 정리
+    AnalysisJob.close()  # 다변량 분석 작업 프로세스 풀 정리
+
+
 app = FastAPI(
     title="Econox API",
     description="Econox Application server",
     docs_url="/api" if system.is_local else None,
     redoc_url="/document" if system.is_local else None,
+    lifespan=lifespan,
 )
 
 # ================= backend =================
@@ -0,0 +1,306 @@
+""" 다변량 분석 작업 큐 (제출, 실행, 결과 조회)와 결과 캐시 """
+
+import json
+import time
+import asyncio
+import multiprocessing
+from typing import List, Literal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import xarray as xr
+import redis.asyncio as redis
+
+from backend.calc import MultivariateAnalyzer
+from backend.integrate import Feature, FeatureGroup
+from backend.data.io import compute_io
+from backend.system import REDIS_CONFIG, CacheTTL, log
+
+AnalysisFunc = Literal["grangercausality", "cointegration"]
+
+
+def _analyze(func: str, names: List[str], series: np.ndarray, budget: float) -> tuple:
+    """
+    - 작업 프로세스에서 실행되는 다변량 분석
+    - return: ({(xt, yt): value}, 모든 쌍을 계산했는지 여부)
+    """
+    dataset = xr.Dataset({name: ("t", values) for name, values in zip(names, series)})
+    analyzer = MultivariateAnalyzer(dataset, budget=budget)
+    return getattr(analyzer, func)(), analyzer.complete
+
+
+class AnalysisCache:
+    """
+    - 다변량 분석 결과를 그룹 내용 주소(작업 ID)로 Redis에 보관하는 캐시입니다.
+        - 키: analysis-result:{job_id}, 값: {"result", "complete"}
+        - 작업 ID는 분석 함수와 FeatureGroup.content_hash(피쳐 구성, 공통 구간, 피쳐별 데이터 버전)로
+            만들기 때문에 저장소가 갱신되면 키가 바뀌고 이전 결과는 더 이상 조회되지 않습니다.
+    - 크기 기반 LRU로 제거합니다.
+        - Sorted Set(analysis-result:index)에 마지막 조회 시각, Hash(analysis-result:sizes)에
+            항목 크기(바이트)를 기록하고 크기 합이 max_bytes를 넘으면 오래된 항목부터 제거합니다.
+        - 만료(expire)된 항목도 제거될 때까지 크기 합에 포함되므로 전체 크기는 max_bytes를 넘지 않습니다.
+    - 모든 쌍을 계산한 결과(complete)만 보관합니다. 부분 결과는 AnalysisJob 상태로만 남습니다.
+    - Redis를 쓸 수 없으면 캐시 없이 진행합니다.
+    """
+
+    key_prefix = "analysis-result"
+    expire = CacheTTL.MID
+    max_bytes = 64 * 1024**2  # 캐시 전체 크기 상한
+    max_entry_bytes = 4 * 1024**2  # 이보다 큰 결과는 보관하지 않습니다.
+    cache = redis.Redis(**REDIS_CONFIG)
+    # 항목을 기록하고 크기 합이 max_bytes 이하가 될 때까지 오래된 항목을 제거합니다.
+    # KEYS: 항목 키, 조회 시각 Sorted Set, 크기 Hash, 크기 합
+    # ARGV: job_id, 값, 값 크기, 현재 시각, expire, max_bytes, 항목 키 접두사
+    put_script = """
+    local previous = tonumber(redis.call("hget", KEYS[3], ARGV[1]) or 0)
+    redis.call("set", KEYS[1], ARGV[2], "ex", ARGV[5])
+    redis.call("zadd", KEYS[2], ARGV[4], ARGV[1])
+    redis.call("hset", KEYS[3], ARGV[1], ARGV[3])
+    local total = redis.call("incrby", KEYS[4], tonumber(ARGV[3]) - previous)
+    while total > tonumber(ARGV[6]) do
+        local oldest = redis.call("zpopmin", KEYS[2])
+        if #oldest == 0 then
+            break
+        end
+        local size = tonumber(redis.call("hget", KEYS[3], oldest[1]) or 0)
+        redis.call("del", ARGV[7] .. oldest[1])
+        redis.call("hdel", KEYS[3], oldest[1])
+        total = redis.call("decrby", KEYS[4], size)
+    end
+    return total
+    """
+
+    @classmethod
+    def _keys(cls, job_id: str) -> tuple:
+        """(항목 키, 조회 시각 Sorted Set 키, 크기 Hash 키, 크기 합 키)"""
+        prefix = cls.key_prefix
+        return tuple(
+            f"{prefix}:{name}" for name in (job_id, "index", "sizes", "bytes")
+        )
+
+    @classmethod
+    async def get(cls, job_id: str) -> dict | None:
+        """보관된 결과를 반환하고 조회 시각을 갱신합니다. 결과가 없으면 None을 반환합니다."""
+        key, index, *_ = cls._keys(job_id)
+        try:
+            async with cls.cache.pipeline(transaction=False) as pipe:
+                await pipe.get(key)
+                await pipe.zadd(index, {job_id: time.time()}, xx=True)
+                value, _ = await pipe.execute()
+        except redis.RedisError as e:
+            log.warning(f"[AnalysisCache] Redis 조회 실패 ({job_id}): {e}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    @classmethod
+    async def put(cls, job_id: str, result: List[dict], complete: bool):
+        """결과를 보관합니다. 부분 결과나 max_entry_bytes보다 큰 결과는 보관하지 않습니다."""
+        if not complete:
+            return
+        value = json.dumps({"result": result, "complete": complete})
+        if (size := len(value.encode())) > cls.max_entry_bytes:
+            return
+        args = (job_id, value, size, time.time(), cls.expire, cls.max_bytes)
+        try:
+            await cls.cache.eval(
+                cls.put_script, 4, *cls._keys(job_id), *args, f"{cls.key_prefix}:"
+            )
+        except redis.RedisError as e:
+            log.warning(f"[AnalysisCache] Redis 기록 실패 ({job_id}): {e}")
+
+
+class AnalysisJob:
+    """
+    - 다변량 분석(MultivariateAnalyzer)을 이벤트 루프 밖의 작업 프로세스에서 실행하고 결과를 보관합니다.
+    - 작업 ID는 분석 함수와 피쳐 그룹 내용 해시(FeatureGroup.content_hash)로 만듭니다.
+        - 같은 내용의 그룹에 대한 분석은 하나의 작업을 공유합니다.
+        - 그룹의 피쳐 구성이나 데이터가 바뀌면 작업 ID도 바뀝니다.
+        - 끝난 작업의 결과는 AnalysisCache에도 보관되므로 작업 상태가 만료된 뒤에도
+            state, submit은 저장소를 읽거나 다시 계산하지 않고 결과를 반환합니다.
+    - 작업 상태는 Redis에 기록하므로 어떤 워커(컨테이너)든 결과를 조회할 수 있습니다.
+        - 키: analysis-job:{job_id}, 값: {"status", "updated", "result", "complete", "error"}
+        - status: pending(대기) -> running(실행 중) -> done(완료) 또는 failed(실패)
+        - SET NX로 상태를 먼저 기록한 워커 하나만 작업을 실행합니다.
+        - Redis를 쓸 수 없으면 프로세스 내 상태만 사용합니다.
+    - 작업 프로세스 풀은 처음 사용할 때 만들고 app.py의 lifespan에서 close로 정리합니다.
+        - 서버가 이미 모든 CPU 코어를 사용하므로 작업 프로세스 수(workers)는 작게 유지합니다.
+
+    ```python
+    group = await FeatureGroup(...).init(load=False)  # 데이터는 실행할 때 읽습니다.
+    job_id, state = await AnalysisJob.submit("cointegration", group)
+    state = await AnalysisJob.wait(job_id, timeout=30)  # 또는 AnalysisJob.state(job_id)로 조회
+    if state["status"] == "done":
+        state["result"]  # [{"xt": ..., "yt": ..., "value": ...}, ...]
+    ```
+    """
+
+    key_prefix = "analysis-job"
+    expire = CacheTTL.MIN
+    budget = 20  # 공적분 계산 시간 제한(초), CointegrationEngine 참고
+    stale = 120  # 이 시간(초)이 지나도 끝나지 않은 작업은 다시 실행합니다.
+    workers = 2  # 작업 프로세스 수
+    poll_interval = 0.2  # wait에서 작업 상태를 확인하는 간격(초)
+    cache = redis.Redis(**REDIS_CONFIG)
+    _executor: ProcessPoolExecutor | None = None
+    _local: dict = {}  # Redis를 쓸 수 없을 때 사용하는 작업 상태
+    _tasks: set = set()  # 실행 중인 asyncio 작업 (GC되지 않도록 참조를 유지)
+
+    @classmethod
+    def executor(cls) -> ProcessPoolExecutor:
+        if cls._executor is None:
+            # uvicorn 워커는 이벤트 루프, zarr-io 스레드, 연결과 잠금을 가지고 있으므로 fork하지 않고
+            # forkserver에서 작업 프로세스를 만듭니다.
+            cls._executor = ProcessPoolExecutor(
+                max_workers=cls.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return cls._executor
+
+    @classmethod
+    async def _execute(cls, *args) -> tuple:
+        """
+        - 작업 프로세스에서 _analyze를 실행합니다.
+        - 작업 프로세스가 죽어서 풀이 망가지면(BrokenProcessPool) 풀을 새로 만들고 한번 더 실행합니다.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = cls.executor()
+            try:
+                return await loop.run_in_executor(executor, _analyze, *args)
+            except BrokenProcessPool:
+                log.warning("[AnalysisJob] 작업 프로세스 풀이 망가져 새로 만듭니다.")
+                if cls._executor is executor:  # 다른 작업이 이미 새로 만들었을 수 있음
+                    cls._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                if attempt:
+                    raise
+
+    @classmethod
+    def close(cls):
+        """작업 프로세스 풀을 정리합니다. 실행 중이지 않은 작업은 취소됩니다."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    @classmethod
+    async def state(cls, job_id: str) -> dict | None:
+        """
+        - 작업 상태를 반환합니다.
+        - 작업 상태가 없으면 AnalysisCache에 보관된 결과를 done 상태로 반환하고
+            그것도 없으면 None을 반환합니다.
+        """
+        try:
+            value = await cls.cache.get(f"{cls.key_prefix}:{job_id}")
+        except redis.RedisError as e:
+            log.warning(f"[AnalysisJob] Redis 조회 실패 ({job_id}): {e}")
+            value = None
+        if value is not None:
+            return json.loads(value)
+        if (state := cls._local.get(job_id)) is not None:
+            return state
+        if (cached := await AnalysisCache.get(job_id)) is not None:
+            return {"status": "done", "updated": time.time()} | cached
+        return None
+
+    @classmethod
+    async def _set(cls, job_id: str, state: dict, nx: bool = False) -> bool:
+        """작업 상태를 기록합니다. nx=True면 상태가 없을 때만 기록하고 기록 여부를 반환합니다."""
+        if nx and job_id in cls._local:
+            return False
+        try:
+            key, value = f"{cls.key_prefix}:{job_id}", json.dumps(state)
+            if not await cls.cache.set(key, value, nx=nx, ex=cls.expire):
+                return False
+        except redis.RedisError as e:
+            log.warning(f"[AnalysisJob] Redis 기록 실패 ({job_id}): {e}")
+            cls._local[job_id] = state
+            return True
+        cls._local.pop(job_id, None)
+        return True
+
+    @classmethod
+    async def submit(cls, func: AnalysisFunc, group: FeatureGroup) -> tuple:
+        """
+        - 초기화된 피쳐 그룹에 대한 분석 작업을 제출합니다.
+            - 그룹은 init(load=False)로 초기화해도 되며 데이터는 실행할 때 읽습니다.
+        - 같은 작업이 이미 있으면 새로 실행하지 않습니다.
+            - 실패했거나 stale초 넘게 끝나지 않은(워커가 죽은) 작업은 다시 실행합니다.
+        - return: (job_id, 작업 상태)
+        """
+        job_id = f"{func}-{group.content_hash()}"
+        state = await cls.state(job_id)
+        if state is not None and not cls._retry(state):
+            return job_id, state
+        # 상태가 없을 때는 SET NX로 한 워커만 실행하도록 합니다.
+        pending = {"status": "pending", "updated": time.time()}
+        if not await cls._set(job_id, pending, nx=state is None):
+            return job_id, await cls.state(job_id) or pending
+        task = asyncio.create_task(cls._run(job_id, func, group))
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+        return job_id, pending
+
+    @classmethod
+    def _retry(cls, state: dict) -> bool:
+        """다시 실행해야 하는 작업인지 확인합니다."""
+        if state["status"] == "failed":
+            return True
+        unfinished = state["status"] in ("pending", "running")
+        return unfinished and time.time() - state["updated"] > cls.stale
+
+    @classmethod
+    async def _run(cls, job_id: str, func: AnalysisFunc, group: FeatureGroup):
+        # 데이터를 읽는 단계의 오류도 failed로 기록해야 작업이 pending으로 남지 않습니다.
+        try:
+            await group.load()
+            dataset = await compute_io(group.to_dataset)
+            names = list(dataset.data_vars)
+            series = np.stack([dataset[name].values for name in names])
+            await cls._set(job_id, {"status": "running", "updated": time.time()})
+            result, complete = await cls._execute(func, names, series, cls.budget)
+            relationships = cls._relationships(group.src, result)
+        except (Exception, asyncio.CancelledError) as e:
+            error = f"{e.__class__.__name__}: {e}"
+            log.info(f"[AnalysisJob] {job_id} 결과 산출 불가능 [{error}]")
+            state = {"status": "failed", "error": error, "updated": time.time()}
+            await cls._set(job_id, state)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+        await AnalysisCache.put(job_id, relationships, complete)
+        await cls._set(
+            job_id,
+            {
+                "status": "done",
+                "result": relationships,
+                "complete": complete,
+                "updated": time.time(),
+            },
+        )
+
+    @staticmethod
+    def _relationships(features: List[Feature], result: dict) -> List[dict]:
+        """분석 결과를 피쳐 정보를 담은 응답 형식으로 바꿉니다. (값이 큰 순서)"""
+        # FeatureGroup에서 repr_str를 통해 피쳐를 구분하므로 이렇게 찾을 수 있음
+        feature_map = {feature.repr_str(): feature for feature in features}
+        relationships = [
+            {
+                "xt": feature_map[xt_key].repr_dict(),
+                "yt": feature_map[yt_key].repr_dict(),
+                "value": value,
+            }
+            for (xt_key, yt_key), value in result.items()
+        ]
+        relationships.sort(key=lambda v: v["value"], reverse=True)
+        return relationships
+
+    @classmethod
+    async def wait(cls, job_id: str, timeout: float) -> dict | None:
+        """작업이 끝나거나(done, failed) timeout초가 지날 때까지 기다린 뒤 작업 상태를 반환합니다."""
+        deadline = time.monotonic() + timeout
+        while (state := await cls.state(job_id)) is not None:
+            if state["status"] in ("done", "failed") or time.monotonic() > deadline:
+                return state
+            await asyncio.sleep(cls.poll_interval)
+        return None
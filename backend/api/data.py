@@ -4,24 +4,31 @@
 """
 
 import asyncio
-from typing import Literal, List
+from datetime import date
+from itertools import combinations
+from typing import Annotated, Literal, List
 
 import numpy as np
+import xarray as xr
 from aiocache import cached
 from pydantic import BaseModel
-from fastapi import HTTPException, Response, Query
+from fastapi import HTTPException, Request, Response, Query
+from fastapi.responses import StreamingResponse
 
 from backend import db
 from backend.http import APIRouter
-from backend.calc import (
-    datetime2utcstr,
-    utcstr2datetime,
-    MultivariateAnalyzer,
-    get_ratio,
-)
+from backend.calc import datetime2utcstr, utcstr2datetime, RollingStatistics
 from backend.data import fmp
 from backend.system import ElasticRedisCache, CacheTTL, log
-from backend.integrate import get_element, get_name, Feature, FeatureGroup
+from backend.analysis import AnalysisJob, AnalysisFunc
+from backend.integrate import (
+    get_element,
+    get_name,
+    Feature,
+    FeatureGroup,
+    downsample,
+    time_series_response,
+)
 
 
 router = APIRouter("data")
@@ -104,21 +111,38 @@ class TimeSeries(BaseModel):
     t: List[str]
 
 
-@router.basic.get("/feature")
+# 차트 데이터 다운샘플링 쿼리 파라미터
+# - points: 응답할 시점 개수 (대략), 지정하지 않으면 모든 시점을 응답합니다.
+# - downsampling: lttb(모양 보존) 또는 minmax(버킷별 최솟값, 최댓값 보존)
+Points = Annotated[int | None, Query(ge=3, le=100_000)]
+Downsampling = Literal["lttb", "minmax"]
+
+
+@router.basic.get("/feature", fast=True)
 async def get_feature_time_series(
-    element_section: str, element_code: str, factor_section: str, factor_code: str
+    request: Request,
+    element_section: str,
+    element_code: str,
+    factor_section: str,
+    factor_code: str,
+    start: date | None = None,
+    end: date | None = None,
+    points: Points = None,
+    downsampling: Downsampling = "lttb",
 ) -> TimeSeries:
     """
     - Element의 Factor 시계열 데이터를 응답합니다.
+    - start, end: 응답할 기간 (양 끝 포함, 선택), 기간에 해당하는 부분만 저장소에서 읽습니다.
+    - points: 응답할 시점 개수 (대략, 선택), downsampling 방식으로 시점을 줄입니다.
+    - Accept 헤더가 application/vnd.econox.columnar면 바이너리 컬럼 형식으로 응답합니다.
+        - 형식은 backend/integrate.py의 COLUMNAR_MEDIA_TYPE 설명을 참고하세요.
     - 해당 Element가 Factor를 지원하지 않는 경우 Element에서 Factor를 제거합니다.
         - 서버가 이 사실을 처음 알게 되었을때 수행됩니다.
     """
     feature = Feature(element_section, element_code, factor_section, factor_code)
-    if (data := await feature.to_data_array()) is not None:
-        return {
-            "v": data.values.tolist(),
-            "t": np.datetime_as_string(data.t.values, unit="D").tolist(),
-        }
+    if (data := await feature.to_data_array(start=start, end=end)) is not None:
+        [data] = downsample(data, points=points, method=downsampling)
+        return time_series_response(request, {"v": data.values, "t": data.t.values})
     else:
         await db.SQL(
             """
@@ -166,11 +190,22 @@ class TimeSeriesGroup(TimeSeries):
     v: List[dict]
 
 
-@router.basic.get("/features")
-async def get_feature_group_time_series(group_id: int) -> TimeSeriesGroup:
+@router.basic.get("/features", fast=True)
+async def get_feature_group_time_series(
+    request: Request,
+    group_id: int,
+    start: date | None = None,
+    end: date | None = None,
+    points: Points = None,
+    downsampling: Downsampling = "lttb",
+) -> TimeSeriesGroup:
     """
     - 피쳐 그룹에 속한 모든 피쳐의 시계열 데이터를 응답합니다.
         - 최근에 추가된 피쳐가 앞에 위치하도록 정렬되어 있습니다.
+    - start, end: 응답할 기간 (양 끝 포함, 선택), 기간에 해당하는 부분만 저장소에서 읽습니다.
+    - points: 응답할 시점 개수 (대략, 선택), downsampling 방식으로 시점을 줄입니다.
+        - 모든 피쳐가 같은 시점들로 줄어들므로 시간축은 계속 공유됩니다.
+    - Accept 헤더가 application/vnd.econox.columnar면 바이너리 컬럼 형식으로 응답합니다.
     - 응답 본문의 크기는 대략 5 ~ 10 MB 이내입니다.
         - 본문이 커서 swagger 문서가 응답을 표시하지 못합니다.
     - ratio는 해당 시점에서 피쳐의 비율을 백분율로 나타냅니다.
@@ -181,10 +216,10 @@ async def get_feature_group_time_series(group_id: int) -> TimeSeriesGroup:
         fetch="all",
     ).exec()
     features = [Feature(**feature_attr) for feature_attr in feature_attrs]
-    group = await FeatureGroup(*features).init()
-    ds_original = group.to_dataset()
-    ds_scaled = group.to_dataset(minmax_scaling=True)
-    ds_ratio = get_ratio(ds_original)
+    group = await FeatureGroup(*features, start=start, end=end).init()
+    ds_original, ds_scaled, ds_ratio = downsample(
+        *group.derived(), points=points, method=downsampling
+    )
 
     values = []
     for feature in features:
@@ -199,57 +234,209 @@ async def get_feature_group_time_series(group_id: int) -> TimeSeriesGroup:
                     "section": feature.factor_section,
                     "code": feature.factor_code,
                 },
-                "original": ds_original[key].values.tolist(),
-                "scaled": ds_scaled[key].values.tolist(),
-                "ratio": ds_ratio[key].values.tolist(),
+                "original": ds_original[key].values,
+                "scaled": ds_scaled[key].values,
+                "ratio": ds_ratio[key].values,
             }
         )
-    return {  # 시간축은 모두 동일함
-        "t": np.datetime_as_string(ds_original.t.values, unit="D").tolist(),
-        "v": values,
-    }
+    # 시간축은 모두 동일함
+    return time_series_response(request, {"t": ds_original.t.values, "v": values})
 
 
-@router.basic.get("/features/analysis/{func}")
-async def get_feature_group_time_series(
-    group_id: int, func: Literal["grangercausality", "cointegration"]
-):
-    """
-    - 다변량 분석 API
-    """
+async def init_feature_group(
+    group_id: int,
+    load: bool = True,
+    start: date | None = None,
+    end: date | None = None,
+) -> FeatureGroup:
+    """피쳐 그룹 ID로 초기화된 FeatureGroup 객체를 만듭니다. (load: FeatureGroup.init 참고)"""
     feature_attrs = await db.SQL(
         query_get_features_in_feature_group,
         params={"feature_group_id": group_id},
         fetch="all",
     ).exec()
     features = [Feature(**feature_attr) for feature_attr in feature_attrs]
-    group = await FeatureGroup(*features).init()
-    dataset = group.to_dataset()
-    analyzer = MultivariateAnalyzer(dataset)
-    target_func = getattr(analyzer, func)
+    return await FeatureGroup(*features, start=start, end=end).init(load)
 
-    try:
-        result: dict = target_func()
-    except Exception as e:
-        log.info(
-            f"[GET /api/data/features/analysis/{func}] 결과 산출 불가능, 빈 배열을 응답합니다. "
-            f"[{e.__class__.__name__}: {e}]"
-        )
-        return []
 
-    response = []
-    feature_map = {feature.repr_str(): feature for feature in features}
-    for (xt_key, yt_key), value in result.items():
-        # FeatureGroup에서 repr_str를 통해 피쳐를 구분하므로 이렇게 찾을 수 있음
-        response.append(
-            {
-                "xt": feature_map[xt_key].repr_dict(),
-                "yt": feature_map[yt_key].repr_dict(),
-                "value": value,
-            }
-        )
-    response.sort(key=lambda v: v["value"], reverse=True)
-    return response
+# 이동 통계량 구간 길이 (일)
+RollingWindow = Annotated[int, Query(ge=2, le=3650)]
+
+
+async def rolling_statistics(
+    group_id: int, start: date | None, end: date | None
+) -> tuple:
+    """
+    - 이동 통계량 API들이 공유하는 피쳐 그룹 초기화
+    - return: (피쳐 목록, (피쳐 수, n) 일별 배열, t축)
+    """
+    group = await init_feature_group(group_id, start=start, end=end)
+    series = np.stack([group[fe].daily.values for fe in group.src])
+    return group.src, series, group[group.src[0]].t.values
+
+
+def rolling_feature_values(features: List[Feature], values: np.ndarray) -> List[dict]:
+    """피쳐별 이동 통계량을 /features 응답과 같은 형식으로 만듭니다."""
+    return [
+        {
+            "element": {"section": fe.element_section, "code": fe.element_code},
+            "factor": {"section": fe.factor_section, "code": fe.factor_code},
+            "values": each,
+        }
+        for fe, each in zip(features, values)
+    ]
+
+
+# /features/analysis/{func} 보다 먼저 등록해야 경로가 가려지지 않습니다.
+@router.basic.get("/features/analysis/rolling_correlation", fast=True)
+async def get_feature_group_rolling_correlation(
+    request: Request,
+    group_id: int,
+    window: RollingWindow = 60,
+    start: date | None = None,
+    end: date | None = None,
+    points: Points = None,
+    downsampling: Downsampling = "lttb",
+):
+    """
+    - 피쳐 그룹에 속한 모든 피쳐 쌍의 이동 상관계수(피어슨)를 응답합니다.
+    - window: 구간 길이(일), t의 각 시점은 그 시점에서 끝나는 구간의 값입니다.
+        - 공통 구간의 처음 window - 1일은 구간이 채워지지 않으므로 응답하지 않습니다.
+        - 구간에 값이 없거나 값이 일정한 피쳐가 있으면 NaN(null)입니다.
+    - start, end, points, downsampling: GET /api/data/features 참고
+    - Response: {"t": [...], "v": [{"xt": 피쳐, "yt": 피쳐, "values": [...]}, ...]}
+    """
+    features, series, t = await rolling_statistics(group_id, start, end)
+    pairs = list(combinations(range(len(features)), 2))
+    correlation = RollingStatistics(series, window).correlation(pairs)
+    ds = xr.Dataset(
+        {str(i): ("t", values) for i, values in enumerate(correlation)},
+        coords={"t": t[window - 1 :]},
+    )
+    if pairs:  # 피쳐가 하나면 쌍이 없음
+        (ds,) = downsample(ds, points=points, method=downsampling)
+    values = [
+        {
+            "xt": features[x].repr_dict(),
+            "yt": features[y].repr_dict(),
+            "values": ds[str(i)].values,
+        }
+        for i, (x, y) in enumerate(pairs)
+    ]
+    return time_series_response(request, {"t": ds.t.values, "v": values})
+
+
+@router.basic.get("/features/analysis/rolling_zscore", fast=True)
+async def get_feature_group_rolling_zscore(
+    request: Request,
+    group_id: int,
+    window: RollingWindow = 60,
+    start: date | None = None,
+    end: date | None = None,
+    points: Points = None,
+    downsampling: Downsampling = "lttb",
+):
+    """
+    - 피쳐 그룹에 속한 피쳐별 이동 z-score를 응답합니다.
+        - 각 시점의 값이 그 시점에서 끝나는 구간의 평균에서 표준편차의 몇 배만큼 떨어져 있는지
+    - window, start, end, points, downsampling: GET /api/data/features/analysis/rolling_correlation 참고
+    - Response: {"t": [...], "v": [{"element", "factor", "values"}, ...]}
+    """
+    features, series, t = await rolling_statistics(group_id, start, end)
+    zscore = RollingStatistics(series, window).zscore()
+    ds = xr.Dataset(
+        {str(i): ("t", values) for i, values in enumerate(zscore)},
+        coords={"t": t[window - 1 :]},
+    )
+    (ds,) = downsample(ds, points=points, method=downsampling)
+    values = rolling_feature_values(features, ds.to_array().values)
+    return time_series_response(request, {"t": ds.t.values, "v": values})
+
+
+@router.basic.get("/features/analysis/rolling_volatility", fast=True)
+async def get_feature_group_rolling_volatility(
+    request: Request,
+    group_id: int,
+    window: RollingWindow = 60,
+    start: date | None = None,
+    end: date | None = None,
+    points: Points = None,
+    downsampling: Downsampling = "lttb",
+):
+    """
+    - 피쳐 그룹에 속한 피쳐별 이동 변동성(일별 변화량의 이동 표준편차)을 응답합니다.
+        - 공통 구간의 처음 window일은 구간이 채워지지 않으므로 응답하지 않습니다.
+    - window, start, end, points, downsampling: GET /api/data/features/analysis/rolling_correlation 참고
+    - Response: {"t": [...], "v": [{"element", "factor", "values"}, ...]}
+    """
+    features, series, t = await rolling_statistics(group_id, start, end)
+    volatility = RollingStatistics.volatility(series, window)
+    ds = xr.Dataset(
+        {str(i): ("t", values) for i, values in enumerate(volatility)},
+        coords={"t": t[window:]},
+    )
+    (ds,) = downsample(ds, points=points, method=downsampling)
+    values = rolling_feature_values(features, ds.to_array().values)
+    return time_series_response(request, {"t": ds.t.values, "v": values})
+
+
+@router.basic.get("/features/analysis/{func}")
+async def get_feature_group_time_series(
+    response: Response, group_id: int, func: AnalysisFunc
+):
+    """
+    - 다변량 분석 API
+    - 계산은 작업 프로세스에서 수행하며 결과가 나올 때까지 기다립니다. (AnalysisJob 참고)
+        - 같은 내용의 그룹에 대한 결과는 저장소를 읽거나 다시 계산하지 않고 재사용됩니다. (AnalysisCache 참고)
+        - 기다리는 시간이 지나도 끝나지 않으면 202 상태 코드와 함께 작업 ID를 응답합니다.
+            이후 GET /api/data/features/analysis/jobs/{job_id}로 결과를 조회합니다.
+    - 공적분 계산이 제한 시간 안에 끝나지 않으면 계산된 쌍까지만 응답하며
+        X-Partial-Result: true 헤더가 붙습니다.
+    """
+    group = await init_feature_group(group_id, load=False)
+    job_id, state = await AnalysisJob.submit(func, group)
+    state = await AnalysisJob.wait(job_id, timeout=AnalysisJob.budget + 10) or state
+    match state["status"]:
+        case "done":
+            if not state["complete"]:
+                response.headers["X-Partial-Result"] = "true"
+            return state["result"]
+        case "failed":
+            log.info(
+                f"[GET /api/data/features/analysis/{func}] 결과 산출 불가능, 빈 배열을 응답합니다. "
+                f"[{state['error']}]"
+            )
+            return []
+        case _:
+            response.status_code = 202
+            return {"job_id": job_id, "status": state["status"]}
+
+
+@router.basic.post("/features/analysis/{func}/jobs", status_code=202)
+async def submit_feature_group_analysis(group_id: int, func: AnalysisFunc):
+    """
+    - 다변량 분석 작업을 제출하고 기다리지 않고 작업 ID를 응답합니다.
+    - 결과는 GET /api/data/features/analysis/jobs/{job_id}로 조회합니다.
+    - Response: job_id, status (pending, running, done, failed)
+    """
+    group = await init_feature_group(group_id, load=False)
+    job_id, state = await AnalysisJob.submit(func, group)
+    return {"job_id": job_id, "status": state["status"]}
+
+
+@router.basic.get("/features/analysis/jobs/{job_id}")
+async def get_feature_group_analysis(job_id: str):
+    """
+    - 다변량 분석 작업 상태와 결과를 조회합니다.
+    - Response: job_id, status와 상태에 따른 값
+        - done: result (GET /api/data/features/analysis/{func} 응답과 같은 배열),
+            complete (모든 쌍을 계산했는지 여부)
+        - failed: error
+    - 작업이 없거나 만료된 경우 404
+    """
+    if (state := await AnalysisJob.state(job_id)) is None:
+        raise HTTPException(status_code=404, detail="The analysis job does not exist")
+    return {"job_id": job_id} | state
 
 
 @router.professional.get("/feature/file")
@@ -263,6 +450,7 @@ async def download_feature_time_series(
     """
     - Element의 Factor 시계열 데이터를 파일로 만들어서 응답합니다.
     - 파일 형식은 csv와 xlsx만 지원됩니다.
+        - csv는 행 단위 조각으로 스트리밍합니다.
     """
     feature = Feature(element_section, element_code, factor_section, factor_code)
 
@@ -276,8 +464,9 @@ async def download_feature_time_series(
         "csv": "text/csv",
         "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     }
+    response_class = {"csv": StreamingResponse, "xlsx": Response}
 
-    return Response(
+    return response_class[file_format](
         content=await func[file_format](),
         media_type=media_type[file_format],
         headers=headers[file_format],
@@ -294,6 +483,7 @@ async def download_feature_group_time_series(
     """
     - 피쳐 그룹에 속한 모든 피쳐의 시계열 데이터를 파일로 만들어서 응답합니다.
     - 파일 형식은 csv와 xlsx만 지원됩니다.
+        - csv는 행 단위 조각으로 스트리밍합니다.
     """
     feature_attrs = await db.SQL(
         query_get_features_in_feature_group,
@@ -312,21 +502,25 @@ async def download_feature_group_time_series(
         "csv": "text/csv",
         "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     }
+    response_class = {"csv": StreamingResponse, "xlsx": Response}
 
-    return Response(
+    return response_class[file_format](
         content=await func[file_format](lang=lang, minmax_scaling=minmax_scaling),
         media_type=media_type[file_format],
         headers=headers[file_format],
     )
 
 
-@router.public.get("/features/public")
+@router.public.get("/features/public", fast=True)
 async def get_public_feature_group_data(
     group_id: int,
     lang: str = Query(..., min_length=2, max_length=2),
+    points: Points = None,
+    downsampling: Downsampling = "lttb",
 ):
     """
     - 퍼블릭 피쳐 그룹 데이터 제공
+    - points: line, ratio 차트 데이터의 시점 개수 (대략, 선택), downsampling 방식으로 시점을 줄입니다.
     """
     # ========== DB 데이터 추출 ==========
     dbdata = await db.SQL(
@@ -411,16 +605,18 @@ async def get_public_feature_group_data(
     # ================================
 
     # ========== 차트 데이터 생성 ==========
-    fgroup = await FeatureGroup(*features).init()
-    dataset = fgroup.to_dataset()
+    # 다변량 분석 차트는 캐시된 결과가 있으면 데이터를 읽지 않으므로 필요할 때 load합니다.
+    fgroup = await FeatureGroup(*features).init(load=False)
     match db_fgroup["chart_type"]:
         case "line" | "ratio":
+            await fgroup.load()
+            dataset, ds_scaled, ds_ratio = downsample(
+                *fgroup.derived(), points=points, method=downsampling
+            )
             data = {
                 "t": np.datetime_as_string(dataset.t.values, unit="D").tolist(),
                 "v": [],
             }
-            ds_scaled = fgroup.to_dataset(minmax_scaling=True)
-            ds_ratio = get_ratio(dataset)
             for fe in features:
                 key = fe.repr_str()
                 data["v"].append(
@@ -433,36 +629,24 @@ async def get_public_feature_group_data(
                             "section": fe.factor_section,
                             "code": fe.factor_code,
                         },
-                        "original": dataset[key].values.tolist(),
-                        "scaled": ds_scaled[key].values.tolist(),
-                        "ratio": ds_ratio[key].values.tolist(),
+                        "original": dataset[key].values,
+                        "scaled": ds_scaled[key].values,
+                        "ratio": ds_ratio[key].values,
                     }
                 )
         case "granger" | "coint":
-            data = []
-            if db_fgroup["chart_type"] == "granger":
-                func = MultivariateAnalyzer(dataset).grangercausality
-            elif db_fgroup["chart_type"] == "coint":
-                func = MultivariateAnalyzer(dataset).cointegration
-            try:
-                result = func()
-            except Exception as e:
+            chart_func = {"granger": "grangercausality", "coint": "cointegration"}
+            func = chart_func[db_fgroup["chart_type"]]
+            job_id, _ = await AnalysisJob.submit(func, fgroup)
+            state = await AnalysisJob.wait(job_id, timeout=AnalysisJob.budget + 10)
+            if state is not None and state["status"] == "done":
+                data = state["result"]
+            else:
                 log.info(
                     f"[GET /api/data/features/public] {group_id} 그룹의 다변량 분석 차트 {db_fgroup['chart_type']} "
-                    f"계산 중 오류가 발생하였습니다. 빈 데이터로 대체합니다. [Error: {e.__class__.__name__}-{e}]"
-                )
-                result = {}
-            feature_map = {feature.repr_str(): feature for feature in features}
-            for (xt_key, yt_key), value in result.items():
-                # FeatureGroup에서 repr_str를 통해 피쳐를 구분하므로 이렇게 찾을 수 있음
-                data.append(
-                    {
-                        "xt": feature_map[xt_key].repr_dict(),
-                        "yt": feature_map[yt_key].repr_dict(),
-                        "value": value,
-                    }
+                    f"계산에 실패했거나 끝나지 않았습니다. 빈 데이터로 대체합니다. [{state}]"
                 )
-            data.sort(key=lambda v: v["value"], reverse=True)
+                data = []
     # ================================
 
     # ========== 응답 본문 구성 ==========
@@ -1,8 +1,11 @@
 """ 고성능 수학 연산 모듈 """
 
 import math
-from typing import Callable
+import time
+from typing import Callable, Dict, List, Literal, Tuple
+from functools import partial
 from itertools import permutations, combinations
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
 import pytz
@@ -10,8 +13,13 @@ import numpy as np
 import xarray as xr
 from numpy.typing import NDArray
 from pydantic import constr
+from scipy import stats
 from scipy.interpolate import PchipInterpolator
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.linalg import qr, solve_triangular
 from statsmodels.tsa.stattools import grangercausalitytests, coint
+from statsmodels.tsa.adfvalues import mackinnonp
+from statsmodels.tools.sm_exceptions import InfeasibleTestError
 
 from backend.system import MEMBERSHIP, LogSuppressor
 
@@ -55,6 +63,70 @@ def interpolation(data: xr.DataArray, *, interpolator: Callable = PchipInterpola
     )
 
 
+def batch_interpolation(
+    data: xr.Dataset, *, interpolator: Callable = PchipInterpolator
+) -> xr.Dataset:
+    """
+    - t축을 공유하는 여러 변수를 한번에 연속적인 일별 데이터로 보간합니다.
+        - 정렬, 중복 제거, 일별 t축 구성을 한번만 하고 변수마다 보간만 따로 합니다.
+        - 각 변수의 결과는 변수마다 interpolation을 호출한 결과와 같습니다.
+    - data: 시간 t에 대한 변수들을 가지는 Dataset (t × 변수 2차원 블록)
+        - 결측치 있어도 됌, 정렬 되어있지 않아도 됌, 동일한 날짜 여러개 있어도 됌
+        - 유효한 값이 2개 미만인 변수는 보간할 수 없으므로 결과에서 빠집니다.
+    - interpolator: scipy.interpolate 함수 (default: PchipInterpolator)
+    - return: 일별 t축을 공유하는 Dataset
+        - {변수}: 연속화된 시계열 데이터, 변수의 첫 관측 이전과 마지막 관측 이후는 nan
+        - {변수}__mask: 해당 t축에 할당된 값이 원본이면 True인 bool Array
+        - {변수}의 attrs: 입력 변수의 attrs + interpolation 메타데이터 + 관측 구간(t_range)
+    """
+    # compute() 되지 않은 dask Array인 경우 엄청 오래걸립니다. 무조건 모두 메모리로 불러와야 함.
+    cleansed = data.compute().drop_duplicates("t").sortby("t")
+    t = cleansed.t.values
+    block = np.column_stack([var.values for var in cleansed.data_vars.values()])
+    block = block.astype(float).reshape(t.size, -1)
+    valid = ~np.isnan(block)
+    columns = [
+        (i, name)
+        for i, name in enumerate(cleansed.data_vars)
+        if np.count_nonzero(valid[:, i]) >= 2
+    ]
+    if not columns:
+        return xr.Dataset(attrs=data.attrs)
+
+    # 모든 변수의 관측 구간을 포함하는 일단위 t축을 한번만 구성합니다.
+    day = np.timedelta64(1, "D")
+    first = t[valid.argmax(axis=0)]  # 변수별 첫 관측 시점
+    last = t[t.size - 1 - valid[::-1].argmax(axis=0)]  # 변수별 마지막 관측 시점
+    kept = [i for i, _ in columns]
+    daily_t = np.arange(first[kept].min(), last[kept].max() + day, day)
+    grid = daily_t.astype(float)
+
+    variables = {}
+    for i, name in columns:
+        observed_t, observed_x = t[valid[:, i]], block[valid[:, i], i]
+        start = np.searchsorted(daily_t, first[i])
+        stop = np.searchsorted(daily_t, last[i], side="right")
+        daily_x = np.full(daily_t.size, np.nan)
+        interp = interpolator(observed_t.astype(float), observed_x)
+        daily_x[start:stop] = interp(grid[start:stop])
+        mask = np.zeros(daily_t.size, dtype=bool)  # 원본 값 찾기용
+        position = np.searchsorted(daily_t, observed_t).clip(max=daily_t.size - 1)
+        mask[position[daily_t[position] == observed_t]] = True
+        metadata = {
+            "normalize": {
+                "interpolation": {
+                    "method": interpolator.__name__,
+                    "ratio": 1 - float(mask[start:stop].mean()),  # 보간된 값의 비율
+                },
+            },
+            "t_range": np.datetime_as_string([first[i], last[i]], unit="D").tolist(),
+        }
+        # 원본 메타데이터 보존
+        variables[name] = ("t", daily_x, cleansed[name].attrs | metadata)
+        variables[f"{name}__mask"] = ("t", mask)
+    return xr.Dataset(variables, coords={"t": daily_t}, attrs=data.attrs)
+
+
 def deinterpolate(dataset: xr.Dataset) -> xr.DataArray:
     """
     - interpolation의 역함수
@@ -84,23 +156,115 @@ def get_ratio(dataset: xr.Dataset):
     """
     - 시계열 dataset에서 각 변수들의 비율을 나타내는 새로운 dataset 생성
     """
-    ds_pos = dataset.copy(deep=True)
-    for var_name in ds_pos.data_vars:
-        # 비율 계산 시 음수는 취급할 수 없으므로 모든 음수를 0으로 변환
-        ds_pos[var_name] = xr.where(ds_pos[var_name] < 0, 0, ds_pos[var_name])
-    # 각 시점(t)에서 모든 변수의 합계를 계산 -> _sum
-    _sum = ds_pos.to_array(dim="v").sum(dim="v")
-    ds_ratio = (ds_pos / _sum) * 100
-    # 각 변수를 해당 시점의 합계로 나누어 비율 계산 후 100을 곱해서 백분율로 변환
-
-    # _sum이 0인 경우 0으로 나누어져서 값은 nan이 된다.
-    # _sum이 0이라는 것은 모든 값의 0이고 다시말해 비율이 동일하다는 뜻이므로 모두 동일한 비율로 처리
-    default = 100 / len(dataset.data_vars)
-    for var_name in ds_ratio.data_vars:
-        ds_ratio[var_name] = xr.where(  # nan이면 default, 아니면 원래값
-            np.isnan(ds_ratio[var_name]), default, ds_ratio[var_name]
+    names = list(dataset.data_vars)
+    values = np.stack([dataset[name].values for name in names])
+    # 비율 계산 시 음수는 취급할 수 없으므로 모든 음수를 0으로 변환 (nan은 유지)
+    values = np.where(values < 0, 0, values)
+    # 각 시점(t)에서 모든 변수의 합계(nan 제외)로 나누고 100을 곱해서 백분율로 변환
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = values / np.nansum(values, axis=0) * 100
+    # 합계가 0이면 0으로 나누어져서 값은 nan이 된다.
+    # 합계가 0이라는 것은 모든 값의 0이고 다시말해 비율이 동일하다는 뜻이므로 모두 동일한 비율로 처리
+    ratio[np.isnan(ratio)] = 100 / len(names)
+    return xr.Dataset(
+        {name: (dataset[name].dims, ratio[i]) for i, name in enumerate(names)},
+        coords=dataset.coords,
+    )
+
+
+def lttb(y: NDArray, points: int, x: NDArray | None = None) -> NDArray:
+    """
+    - Largest-Triangle-Three-Buckets 알고리즘으로 시계열을 points개 시점으로 줄입니다.
+    - y: 값 배열, x: 시점 배열 (None이면 등간격)
+    - return: 선택된 시점들의 인덱스 (첫 시점과 마지막 시점은 항상 포함)
+    - 버킷마다 직전에 선택된 점과 다음 버킷의 평균점으로 만든 삼각형의 넓이가 가장 큰 점을 고릅니다.
+        - 버킷 안의 넓이 계산은 벡터 연산이며 다음 버킷 평균은 누적합으로 한번에 구합니다.
+    - NaN은 평균과 선택에서 제외합니다. (이동 통계량처럼 NaN이 섞인 시계열)
+    """
+    size = len(y)
+    if points >= size or points < 3:
+        return np.arange(size)
+    x = np.arange(size, dtype=float) if x is None else np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~np.isnan(y)  # NaN은 평균에서 빼고 고르지 않습니다.
+    # 첫 점과 마지막 점을 뺀 구간을 points - 2개 버킷으로 나눕니다.
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    bounds = np.append(edges, size)  # 마지막 버킷의 다음 버킷은 마지막 점
+    cum_n = np.concatenate([[0], np.cumsum(valid)])
+    cum_x = np.concatenate([[0], np.cumsum(np.where(valid, x, 0))])
+    cum_y = np.concatenate([[0], np.cumsum(np.where(valid, y, 0))])
+    count = cum_n[bounds[2:]] - cum_n[bounds[1:-1]]
+    with np.errstate(divide="ignore", invalid="ignore"):  # 값이 모두 NaN인 버킷은 NaN
+        avg_x = (cum_x[bounds[2:]] - cum_x[bounds[1:-1]]) / count
+        avg_y = (cum_y[bounds[2:]] - cum_y[bounds[1:-1]]) / count
+
+    selected = np.empty(points, dtype=np.intp)
+    selected[0], selected[-1] = 0, size - 1
+    anchor = 0  # 직전에 선택된 점 중 값이 있는 점
+    for i in range(points - 2):
+        start, stop = edges[i], edges[i + 1]
+        a_x, a_y = x[anchor], y[anchor]
+        area = np.abs(
+            (a_x - avg_x[i]) * (y[start:stop] - a_y)
+            - (a_x - x[start:stop]) * (avg_y[i] - a_y)
         )
-    return ds_ratio
+        if np.isnan(area).all():
+            # 직전 점이나 다음 버킷에 값이 없으면 버킷의 첫 유효값, 버킷에 값이 없으면 첫 점
+            inside = np.flatnonzero(valid[start:stop])
+            pick = inside[0] if inside.size else 0
+        else:
+            pick = np.nanargmax(area)
+        selected[i + 1] = start + pick
+        if valid[start + pick]:
+            anchor = start + pick
+    return selected
+
+
+def minmax_buckets(y: NDArray, points: int) -> NDArray:
+    """
+    - 시계열을 points // 2개 버킷으로 나누고 버킷마다 최솟값과 최댓값 시점만 남깁니다.
+    - return: 선택된 시점들의 인덱스 (첫 시점과 마지막 시점은 항상 포함)
+    - 버킷들을 같은 길이로 채운 2차원 배열로 만들어 한번에 계산합니다.
+    """
+    size = len(y)
+    if points >= size or points < 2:
+        return np.arange(size)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(0, size, points // 2 + 1).astype(int)
+    width = np.max(np.diff(edges))
+    index = edges[:-1, None] + np.arange(width)
+    inside = index < edges[1:, None]
+    values = y[index.clip(max=size - 1)]
+    # NaN은 고르지 않습니다. 값이 모두 NaN인 버킷은 버킷의 첫 점만 남습니다.
+    low = np.where(inside & ~np.isnan(values), values, np.inf).argmin(axis=1)
+    high = np.where(inside & ~np.isnan(values), values, -np.inf).argmax(axis=1)
+    selected = np.concatenate([edges[:-1] + low, edges[:-1] + high, [0, size - 1]])
+    return np.unique(selected)
+
+
+def downsample_indices(
+    values: NDArray,
+    points: int,
+    method: Literal["lttb", "minmax"] = "lttb",
+    x: NDArray | None = None,
+) -> NDArray:
+    """
+    - 차트 표시용으로 시계열을 points개 정도의 시점으로 줄일 인덱스를 반환합니다.
+    - values: (t,) 또는 (t, 변수) 배열
+        - 변수가 여러개면 변수마다 points / 변수 개수만큼 고른 인덱스의 합집합을 반환합니다.
+            모든 변수가 같은 시점들로 줄어들므로 t축을 공유할 수 있습니다.
+    - method: lttb(Largest-Triangle-Three-Buckets) 또는 minmax(버킷별 최솟값, 최댓값)
+    - x: 시점 배열, lttb에서 시점 간격이 일정하지 않은 경우 사용합니다.
+    """
+    values = np.asarray(values).reshape(len(values), -1)
+    if not values.size or points >= len(values):
+        return np.arange(len(values))
+    budget = max(3, points // values.shape[1])
+    if method == "minmax":
+        chosen = [minmax_buckets(column, budget) for column in values.T]
+    else:
+        chosen = [lttb(column, budget, x) for column in values.T]
+    return np.unique(np.concatenate(chosen))
 
 
 def marge_lists(*lists: list, limit: int) -> list:
@@ -262,8 +426,6 @@ class PairwiseAnalyzer:
         - xt가 yt에 선행하는 정도를 계산해서 0에서 1사이의 값을 반환합니다.
             - lag를 1에서 최대 15까지 계산한 후 귀무가설이 기각된 lag의 비율을 반환합니다.
         """
-        SIGNIFICANCE_LEVEL = 0.01
-
         data = np.column_stack([self.xt, self.yt])
         lags = self._gen_lags_list(data.shape[0])
 
@@ -279,11 +441,19 @@ class PairwiseAnalyzer:
         for lag, rst in result.items():
             for test in rst[0].values():
                 p_values.append(test[1])
-        dismissed_p_values = [v for v in p_values if v < SIGNIFICANCE_LEVEL]
+        return float(self.granger_score(np.array(p_values)))
+
+    @staticmethod
+    def granger_score(p_values: NDArray) -> float | NDArray:
+        """
+        - 모든 lag, 검정의 p-value(마지막 축)로 선후관계 정도를 계산합니다.
+        - 귀무가설이 기각된 p-value의 비율이 50% 이상인 부분을 0에서 1사이로 변환합니다.
+        """
+        SIGNIFICANCE_LEVEL = 0.01
 
-        ratio = len(dismissed_p_values) / len(p_values)
+        ratio = (p_values < SIGNIFICANCE_LEVEL).mean(axis=-1)
         adj = 0.5  # 보다 엄격하게, 50% ~ 100% -> 0% ~ 100%
-        return max(ratio - adj, 0) / (1 - adj)
+        return np.maximum(ratio - adj, 0) / (1 - adj)
 
     def cointegration(self) -> int:
         """
@@ -295,24 +465,246 @@ class PairwiseAnalyzer:
         return 1 if p_value < 0.05 else 0
 
 
+def _granger_p_values(series: NDArray, target: int, lags: List[int]) -> NDArray:
+    """
+    - series[target]을 종속변수로 두고 나머지 모든 시계열에 대해 그레인저 인과관계 검정을 합니다.
+    - statsmodels.grangercausalitytests(addconst=True)와 같은 회귀와 검정을 수행합니다.
+        - 제한 모형: 종속변수의 lag들 + 상수, 비제한 모형: 제한 모형 + 원인 시계열의 lag들
+        - 제한 모형은 원인 시계열과 관계없이 같으므로 한번만 풀고,
+            비제한 모형은 제한 모형의 잔차에 대한 회귀(Frisch-Waugh)로 모든 원인 시계열을 한번에 풉니다.
+        - 최소제곱해는 statsmodels OLS처럼 pinv로 구합니다.
+    - return: (원인 시계열, lag, 검정) 모양의 p-value 배열, 검정 순서는 statsmodels 결과와 같습니다.
+        - ssr_ftest, ssr_chi2test, lrtest, params_ftest
+        - params_ftest는 OLS에서 ssr_ftest와 같은 통계량이므로 같은 값입니다.
+        - 종속변수 자신에 대한 값은 nan입니다.
+    """
+    k, n = series.shape
+    causes = [i for i in range(k) if i != target]
+    p_values = np.full((k, len(lags), 4), np.nan)
+    for li, lag in enumerate(lags):
+        nobs = n - lag
+        # lagged[i, t, j] = series[i, lag + t - (j + 1)], 복사 없는 view
+        lagged = sliding_window_view(series, lag + 1, axis=1)[:, :, lag - 1 :: -1]
+        if (lagged.max(axis=1) == lagged.min(axis=1)).any():
+            raise InfeasibleTestError(
+                "The x values include a column with constant values and so"
+                " the test statistic cannot be computed."
+            )
+        y = series[target, lag:]
+        own = np.column_stack([lagged[target], np.ones(nobs)])
+        own_pinv = np.linalg.pinv(own, rcond=1e-15)
+        resid = y - own @ (own_pinv @ y)
+        ssr_own = resid @ resid
+        # 원인 시계열의 lag들에서 제한 모형으로 설명되는 부분을 제거
+        z = lagged[causes]
+        z = z - own @ (own_pinv @ z)
+        beta = np.linalg.pinv(z, rcond=1e-15) @ resid[:, None]
+        joint_resid = resid - (z @ beta)[..., 0]
+        ssr_joint = (joint_resid**2).sum(axis=1)
+
+        tss = ((y - y.mean()) ** 2).sum()
+        if (
+            tss == 0
+            or (ssr_joint == 0).any()
+            or (ssr_joint / tss < np.finfo(float).eps).any()
+        ):
+            raise InfeasibleTestError(
+                "The Granger causality test statistic cannot be compute "
+                "because the VAR has a perfect fit of the data."
+            )
+        df_resid = nobs - (2 * lag + 1)
+        f_value = (ssr_own - ssr_joint) / ssr_joint / lag * df_resid
+        f_p_value = stats.f.sf(f_value, lag, df_resid)
+        chi2 = nobs * (ssr_own - ssr_joint) / ssr_joint
+        lr = nobs * np.log(ssr_own / ssr_joint)
+        p_values[causes, li] = np.column_stack(
+            [f_p_value, stats.chi2.sf(chi2, lag), stats.chi2.sf(lr, lag), f_p_value]
+        )
+    return p_values
+
+
+class GrangerEngine:
+    """
+    - 여러 시계열의 모든 순서쌍에 대한 그레인저 인과관계를 한번에 계산합니다.
+    - PairwiseAnalyzer.grangercausality를 순서쌍마다 실행한 것과 같은 결과를 반환합니다.
+        - lag 목록, 검정 종류, 유의수준, 점수 계산 방식이 같습니다.
+        - 순서쌍마다 OLS를 다시 적합하지 않고 종속변수마다 배열 연산으로 모든 원인 시계열을 풉니다.
+    - processes: 0보다 크면 종속변수 단위로 프로세스 풀에 나누어 계산합니다.
+        - 프로세스 생성 비용이 있으므로 시계열이 많고 길 때만 의미가 있습니다.
+
+    ```python
+    scores = GrangerEngine(np.stack([a, b, c])).scores()
+    scores[0, 1]  # PairwiseAnalyzer(xt=a, yt=b).grangercausality()
+    ```
+    """
+
+    def __init__(self, series: NDArray, processes: int = 0):
+        """series: (시계열 개수, 시계열 길이) 모양의 배열"""
+        self.series = np.asarray(series, dtype=float)
+        if not np.isfinite(self.series).all():
+            raise ValueError("x contains NaN or inf values.")
+        self.processes = processes
+        self.lags = PairwiseAnalyzer._gen_lags_list(self.series.shape[1])
+
+    def p_values(self) -> NDArray:
+        """
+        - (종속 시계열, 원인 시계열, lag, 검정) 모양의 p-value 배열을 반환합니다.
+        - 대각 성분(자기 자신)은 nan입니다.
+        """
+        targets = range(self.series.shape[0])
+        if self.processes > 0:
+            with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                results = pool.map(
+                    _granger_p_values,
+                    *zip(*[(self.series, i, self.lags) for i in targets]),
+                )
+                return np.stack(list(results))
+        return np.stack([_granger_p_values(self.series, i, self.lags) for i in targets])
+
+    def scores(self) -> NDArray:
+        """
+        - (종속 시계열, 원인 시계열) 모양의 선후관계 정도 배열을 반환합니다. (0 ~ 1)
+        - scores[i, j]는 PairwiseAnalyzer(xt=series[i], yt=series[j]).grangercausality()와 같습니다.
+        - 대각 성분은 0입니다.
+        """
+        p_values = self.p_values()
+        k = p_values.shape[0]
+        scores = PairwiseAnalyzer.granger_score(p_values.reshape(k, k, -1))
+        np.fill_diagonal(scores, 0)
+        return scores
+
+
+def _adf_components(x: NDArray, maxlag: int) -> dict:
+    """
+    - 공적분 검정에서 시계열 하나에만 의존하는 계산 결과들 (CointegrationEngine 참고)
+    - level: 수준 lag, diffs: 차분 lag들, target: 차분 (ADF 회귀에 사용, 복사 없는 view)
+    - pinv: [x, 1]의 유사역행렬 (1단계 회귀에 사용), tss: 편차 제곱합
+    """
+    n = x.shape[0]
+    diff = np.diff(x)
+    return {
+        "level": x[maxlag : n - 1],
+        "diffs": sliding_window_view(diff, maxlag + 1)[:, maxlag - 1 :: -1],
+        "target": diff[maxlag:],
+        "pinv": np.linalg.pinv(np.column_stack([x, np.ones(n)]), rcond=1e-15),
+        "tss": ((x - x.mean()) ** 2).sum(),
+    }
+
+
+def _coint_p_values(
+    series: NDArray, pairs: List[Tuple[int, int]], maxlag: int, deadline: float | None
+) -> Dict[Tuple[int, int], float]:
+    """
+    - 시계열 쌍마다 statsmodels.coint(trend="c", maxlag=maxlag, autolag=None)의 p-value를 계산합니다.
+        - 1단계: y0를 [y1, 1]로 회귀한 잔차 r = y0 - b*y1 - a
+        - 2단계: r에 대한 ADF 회귀(상수 없음, maxlag개의 차분 lag)의 t 통계량
+    - r은 두 시계열의 선형결합이므로 ADF 회귀의 설계행렬도 시계열별 성분의 선형결합입니다.
+        시계열별 성분(_adf_components)은 한번만 만들고 쌍마다 결합만 합니다.
+    - deadline(time.time 기준)이 지나면 남은 쌍은 계산하지 않고 반환합니다.
+    """
+    threshold = 1 - 100 * np.sqrt(np.finfo(np.double).eps)  # statsmodels.coint와 같음
+    components = {}
+    p_values = {}
+    for i, j in pairs:
+        if deadline is not None and time.time() > deadline:
+            break
+        for k in (i, j):
+            if k not in components:
+                components[k] = _adf_components(series[k], maxlag)
+        y0, y1 = components[i], components[j]
+        b, a = y1["pinv"] @ series[i]
+        resid = series[i] - b * series[j] - a
+        if resid @ resid / y0["tss"] > 1 - threshold:  # r-squared < threshold
+            # [설계행렬, 종속변수]의 QR 분해에서 R만 구하면 회귀계수와 잔차제곱합을 알 수 있음
+            nobs, k = y0["level"].shape[0], maxlag + 1
+            augmented = np.empty((nobs, k + 1))
+            augmented[:, 0] = y0["level"] - b * y1["level"] - a
+            augmented[:, 1:k] = y0["diffs"] - b * y1["diffs"]
+            augmented[:, k] = y0["target"] - b * y1["target"]
+            (r,) = qr(augmented, mode="r", overwrite_a=True, check_finite=False)
+            beta = solve_triangular(r[:k, :k], r[:k, k])
+            scale = r[k, k] ** 2 / (nobs - k)  # 잔차제곱합 / 자유도
+            r_inv = solve_triangular(r[:k, :k], np.eye(k))
+            stat = beta[0] / np.sqrt(scale * (r_inv[0] @ r_inv[0]))
+        else:  # 두 시계열이 (거의) 완전한 공선형이면 공적분으로 처리
+            stat = -np.inf
+        p_values[(i, j)] = float(mackinnonp(stat, regression="c", N=2))
+    return p_values
+
+
+class CointegrationEngine:
+    """
+    - 여러 시계열 쌍의 공적분 검정(Engle-Granger)을 한번에 계산합니다.
+    - PairwiseAnalyzer.cointegration과 같은 검정(statsmodels.coint, maxlag 고정)의 p-value를 계산합니다.
+        - 시계열별 ADF 회귀 성분을 한번만 만들어 모든 쌍이 공유합니다.
+    - budget: 계산 시간 제한(초), 시간이 지나면 계산된 쌍까지만 반환하고 complete가 False가 됩니다.
+    - processes: 0보다 크면 쌍들을 나누어 프로세스 풀에서 계산합니다.
+        - 서버가 이미 모든 CPU 코어를 사용하므로 기본값은 0 (현재 스레드에서 계산)입니다.
+
+    ```python
+    engine = CointegrationEngine(np.stack([a, b, c]), budget=10)
+    p_values = engine.p_values([(0, 1), (0, 2), (1, 2)])
+    engine.complete  # 모든 쌍을 계산했는지 여부
+    ```
+    """
+
+    def __init__(
+        self, series: NDArray, budget: float | None = None, processes: int = 0
+    ):
+        """series: (시계열 개수, 시계열 길이) 모양의 배열"""
+        self.series = np.asarray(series, dtype=float)
+        self.budget = budget
+        self.processes = processes
+        self.maxlag = min(self.series.shape[1] // 4, 50)  # 계산시간 10초 미만 보장
+        self.complete = False
+
+    def p_values(self, pairs: List[Tuple[int, int]]) -> Dict[Tuple[int, int], float]:
+        """pairs: (y0, y1) 시계열 번호 쌍들, return: {쌍: p-value}"""
+        deadline = time.time() + self.budget if self.budget is not None else None
+        if self.processes > 0 and len(pairs) > 1:
+            chunks = [pairs[i :: self.processes] for i in range(self.processes)]
+            task = partial(
+                _coint_p_values, self.series, maxlag=self.maxlag, deadline=deadline
+            )
+            p_values = {}
+            with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                for result in pool.map(task, [chunk for chunk in chunks if chunk]):
+                    p_values |= result
+        else:
+            p_values = _coint_p_values(self.series, pairs, self.maxlag, deadline)
+        self.complete = len(p_values) == len(pairs)
+        return p_values
+
+
 class MultivariateAnalyzer:
     """
     - 다변량 시계열 관계 분석기
     - 시계열은 dataset의 변수명으로 구분합니다.
     """
 
-    def __init__(self, dataset: xr.Dataset):
+    def __init__(
+        self, dataset: xr.Dataset, processes: int = 0, budget: float | None = None
+    ):
+        """
+        - processes: GrangerEngine, CointegrationEngine 참고
+        - budget: 공적분 계산 시간 제한(초), CointegrationEngine 참고
+            - 시간이 지나 일부 쌍만 계산되었다면 cointegration 실행 후 complete가 False입니다.
+        """
         self.dataset = dataset
+        self.processes = processes
+        self.budget = budget
+        self.complete = True
         self.perm_pairs = list(permutations(self.dataset.data_vars, 2))
         self.comb_pairs = list(combinations(self.dataset.data_vars, 2))
 
     def grangercausality(self):
+        names = list(self.dataset.data_vars)
+        series = np.stack([self.dataset[name].values for name in names])
+        scores = GrangerEngine(series, processes=self.processes).scores()
+        index = {name: i for i, name in enumerate(names)}
         relationships = {}
         for pair in self.perm_pairs:
-            value = PairwiseAnalyzer(
-                xt=self.dataset[pair[0]].values,
-                yt=self.dataset[pair[1]].values,
-            ).grangercausality()
+            value = float(scores[index[pair[0]], index[pair[1]]])
             if value:
                 relationships[pair] = value
         filtered_relationships = relationships.copy()
@@ -331,11 +723,108 @@ class MultivariateAnalyzer:
         return filtered_relationships
 
     def cointegration(self):
+        names = list(self.dataset.data_vars)
+        series = np.stack([self.dataset[name].values for name in names])
+        engine = CointegrationEngine(series, self.budget, self.processes)
+        index = {name: i for i, name in enumerate(names)}
+        p_values = engine.p_values(
+            [(index[a], index[b]) for a, b in self.comb_pairs]
+        )
+        self.complete = engine.complete
         result = {}
         for pair in self.comb_pairs:
-            value = PairwiseAnalyzer(
-                xt=self.dataset[pair[0]].values, yt=self.dataset[pair[1]].values
-            ).cointegration()
-            if value:
-                result[pair] = value
+            # PairwiseAnalyzer.cointegration과 같은 기준
+            if p_values.get((index[pair[0]], index[pair[1]]), 1) < 0.05:
+                result[pair] = 1
         return result
+
+
+def _window_sums(x: NDArray, window: int) -> NDArray:
+    """
+    - 마지막 축의 길이 window인 모든 구간 합을 누적합 한 번으로 구합니다. O(n)
+    - x: (..., n) 배열
+    - return: (..., n - window + 1) 배열, i번째 값은 x[..., i : i + window]의 합
+    """
+    if x.shape[-1] < window:
+        return np.empty((*x.shape[:-1], 0))
+    cumsum = np.zeros((*x.shape[:-1], x.shape[-1] + 1))
+    np.cumsum(x, axis=-1, out=cumsum[..., 1:])
+    return cumsum[..., window:] - cumsum[..., :-window]
+
+
+class RollingStatistics:
+    """
+    - t축을 공유하는 시계열들(FeatureGroup의 일별 배열)의 이동 통계량
+    - 누적합으로 모든 구간의 합, 제곱합, 곱의 합을 한 번에 구하므로 window와 관계없이 O(n)이며
+        구간마다 반복하지 않습니다.
+        - 누적합의 자릿수 손실을 줄이기 위해 시계열마다 평균을 뺀 뒤 누적합을 구합니다.
+            (분산, 공분산은 평행이동에 불변)
+    - 결과의 i번째 값은 t[i : i + window] 구간의 통계량입니다. (길이 n - window + 1)
+        - 구간에 NaN이 있으면 NaN입니다.
+        - 표준편차는 모집단 표준편차(ddof=0)이며 xarray rolling과 같습니다.
+        - 분산이 0인 구간의 z-score, 상관계수는 NaN입니다.
+
+    ```python
+    stats = RollingStatistics(series, window=60)  # series: (시계열 수, n)
+    stats.zscore()  # (시계열 수, n - window + 1)
+    stats.correlation([(0, 1), (0, 2)])  # (쌍 수, n - window + 1)
+    RollingStatistics.volatility(series, window=60)  # (시계열 수, n - window)
+    ```
+    """
+
+    def __init__(self, series: NDArray, window: int):
+        """
+        - series: (시계열 수, n) 배열
+        - window: 구간 길이 (2 이상)
+        """
+        self.series = np.atleast_2d(np.asarray(series, dtype=float))
+        self.window = window
+        valid = ~np.isnan(self.series)
+        with np.errstate(all="ignore"):  # 값이 모두 NaN인 시계열
+            self.offset = np.nanmean(self.series, axis=1, keepdims=True)
+        self.centered = np.where(valid, self.series - self.offset, 0)
+        complete = _window_sums(valid, window) == window
+        sums = _window_sums(self.centered, window)
+        squares = _window_sums(self.centered**2, window)
+        self.mean = np.where(complete, sums / window, np.nan)  # 평균을 뺀 값의 평균
+        variance = squares / window - self.mean**2
+        # 누적합의 반올림 오차보다 작은 분산은 0으로 봅니다. (값이 일정한 구간)
+        total = np.sum(self.centered**2, axis=1, keepdims=True)
+        tolerance = 16 * np.finfo(float).eps * total / window
+        self.variance = np.where(variance > tolerance, variance, 0)
+        self.variance[np.isnan(variance)] = np.nan
+
+    def std(self) -> NDArray:
+        return np.sqrt(self.variance)
+
+    def zscore(self) -> NDArray:
+        """각 구간의 마지막 값이 구간 평균에서 표준편차의 몇 배만큼 떨어져 있는지"""
+        last = self.centered[:, self.window - 1 :]
+        last = np.where(np.isnan(self.series[:, self.window - 1 :]), np.nan, last)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscore = (last - self.mean) / self.std()
+        return np.where(self.variance > 0, zscore, np.nan)
+
+    def correlation(self, pairs: List[Tuple[int, int]]) -> NDArray:
+        """
+        - pairs: 시계열 인덱스 쌍 목록
+        - return: (쌍 수, n - window + 1) 피어슨 상관계수
+        """
+        if not pairs:
+            return np.empty((0, self.mean.shape[1]))
+        x, y = np.array(pairs).T
+        products = _window_sums(self.centered[x] * self.centered[y], self.window)
+        covariance = products / self.window - self.mean[x] * self.mean[y]
+        scale = self.variance[x] * self.variance[y]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = np.clip(covariance / np.sqrt(scale), -1, 1)
+        return np.where(scale > 0, correlation, np.nan)
+
+    @classmethod
+    def volatility(cls, series: NDArray, window: int) -> NDArray:
+        """
+        - 이동 변동성: 일별 변화량(차분)의 이동 표준편차
+            - 값이 0 이하일 수 있는 지표도 있으므로 수익률(로그 차분) 대신 차분을 사용합니다.
+        - return: (시계열 수, n - window), i번째 값은 t[i + 1 : i + window + 1]의 변화량 구간
+        """
+        return cls(np.diff(np.atleast_2d(series), axis=1), window).std()
@@ -3,21 +3,32 @@
 - FMP의 모든 시계열 데이터 API를 일관된 인터페이스로 제공한다.
 """
 
+import copy
 import json
-from typing import Dict
+import shutil
+import threading
+from typing import Dict, List, Tuple
 from pathlib import PosixPath
 from functools import partial
 from datetime import date, datetime
+from collections import OrderedDict
 
 import numpy as np
 import xarray as xr
 from httpx import HTTPStatusError
 
 from backend.http import FmpAPI
-from backend.calc import interpolation
+from backend.calc import interpolation, batch_interpolation, deinterpolate
 from backend.data.model import Factor
 from backend.data.text import Multilingual
-from backend.data.io import xr_open_zarr, xr_to_zarr
+from backend.data.io import (
+    xr_open_zarr,
+    xr_to_zarr,
+    xr_update_zarr,
+    zarr_io,
+    store_path,
+)
+from backend.data.freshness import FreshnessIndex, RefreshLock
 from backend.system import ROOT_PATH, EFS_VOLUME_PATH
 
 DATA_PATH = EFS_VOLUME_PATH / "features/symbol"
@@ -37,10 +48,101 @@ def _xr_meta(element, factor, **kwargs) -> dict:
     }
 
 
+def _collected_date(dataset: xr.Dataset) -> date:
+    """Dataset 메타데이터에 기록된 수집 날짜"""
+    return datetime.strptime(dataset.attrs["client"]["collected"], "%Y-%m-%d").date()
+
+
+def _to_group(datasets: Dict[str, xr.Dataset], attrs: dict) -> xr.Dataset:
+    """
+    - 펙터별 Dataset(daily, mask)들을 t축을 공유하는 하나의 Dataset으로 합칩니다. (group 레이아웃)
+    - 펙터의 daily와 mask는 각각 {factor}, {factor}__mask 변수가 됩니다.
+        - 펙터의 t축 범위 밖은 daily는 nan, mask는 False로 채워집니다.
+    - 펙터의 attrs와 원래 t축 범위(t_range)는 {factor} 변수의 attrs에 저장됩니다.
+    """
+    if not datasets:
+        return xr.Dataset(attrs=attrs)
+    t = np.unique(np.concatenate([ds.t.values for ds in datasets.values()]))
+    variables = {}
+    for factor, ds in datasets.items():
+        t_range = np.datetime_as_string(ds.t.values[[0, -1]], unit="D").tolist()
+        variables[factor] = ds.daily.reindex(t=t).assign_attrs(
+            ds.attrs | {"t_range": t_range}
+        )
+        variables[f"{factor}__mask"] = ds.mask.reindex(t=t, fill_value=False)
+    return xr.Dataset(variables, attrs=attrs)
+
+
+def _from_group(group: xr.Dataset, factor: str) -> xr.Dataset | None:
+    """
+    - _to_group의 역함수, group Dataset에서 펙터 하나의 Dataset(daily, mask)을 꺼냅니다.
+        - batch_interpolation의 결과도 같은 형태이므로 펙터별로 꺼낼 수 있습니다.
+    - group에 펙터가 없으면 None을 반환합니다.
+    """
+    if factor not in group:
+        return None
+    attrs = dict(group[factor].attrs)
+    start, end = np.array(attrs.pop("t_range"), dtype="datetime64[D]")
+    # 날짜 문자열로 sel 하는 것보다 훨씬 빠릅니다. (끝 날짜는 하루 전체를 포함)
+    window = slice(*group.t.values.searchsorted([start, end + np.timedelta64(1, "D")]))
+    daily = group[factor].isel(t=window)
+    daily.attrs = {}
+    mask = group[f"{factor}__mask"].isel(t=window)
+    return xr.Dataset({"daily": daily, "mask": mask}, attrs=attrs)
+
+
+class InterpolationCache:
+    """
+    - raw 저장소의 관측값을 일별로 보간한 Dataset(daily, mask)을 담는 프로세스 내 LRU 캐시
+    - 키에 수집 날짜가 들어가므로 저장소가 갱신되면 새로 보간합니다.
+    - zarr_io 스레드 풀에서 접근하므로 잠금을 사용합니다.
+    """
+
+    max_size = 256  # 30년치 일별 데이터 하나가 100KB 정도입니다.
+    _lru: OrderedDict = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, key: tuple) -> xr.Dataset | None:
+        with cls._lock:
+            if (dataset := cls._lru.get(key)) is not None:
+                cls._lru.move_to_end(key)
+            return dataset
+
+    @classmethod
+    def put(cls, key: tuple, dataset: xr.Dataset):
+        with cls._lock:
+            cls._lru[key] = dataset
+            cls._lru.move_to_end(key)
+            if len(cls._lru) > cls.max_size:
+                cls._lru.popitem(last=False)
+
+
 class ClientMeta(type):
     # JSON setting에서 선택 키에 대한 기본값과 필수 키 정의
     mandatory = ["api", "note"]
-    optional = {"params": {}, "symbol_in_query": False, "t_key": "date"}
+    optional = {
+        "params": {},
+        "symbol_in_query": False,
+        "t_key": "date",
+        "storage": "daily",
+    }
+
+    # ========= 저장소 레이아웃 =========
+    # - factor: 펙터마다 {symbol}/{class}/{factor}.zarr 저장소를 따로 만듭니다.
+    # - group: 데이터 클래스의 모든 펙터를 {symbol}/{class}.zarr 저장소 하나에 변수로 저장합니다.
+    #     저장소를 한번 열고 메타데이터를 한번 읽으면 되므로 EFS 파일 수와 왕복 횟수가 크게 줄어듭니다.
+    #     기존 저장소는 script/migrate_zarr_layout.py로 옮기세요. 옮기지 않아도 읽기는 가능합니다.
+    layout = "factor"
+
+    # ========= 저장 형식 =========
+    # - 데이터 클래스마다 JSON setting의 storage로 지정합니다. 기본값은 daily입니다.
+    # - daily: 일별로 보간한 데이터(daily, mask)를 저장합니다. layout 설정을 따릅니다.
+    # - raw: 원본 관측값만 {symbol}/{class}.raw.zarr 저장소 하나에 저장하고 읽을 때 보간합니다.
+    #     분기별 재무제표는 관측값보다 90배 정도 많은 일별 값을 저장하지 않아도 되므로
+    #     EFS 용량과 읽기 I/O가 크게 줄어듭니다. 보간 결과는 InterpolationCache에 캐싱됩니다.
+    #     layout 설정과 script/migrate_zarr_layout.py는 raw 형식 클래스에 적용되지 않습니다.
+    # - 어떤 형식이든 저장소가 있으면 읽을 수 있고 다음 갱신 때 설정된 형식으로 다시 저장됩니다.
 
     @classmethod
     def load_config(meta, name) -> dict:
@@ -80,6 +182,7 @@ class ClientMeta(type):
         cls.api_params = get_setting("params")
         cls.t_key = get_setting("t_key")
         cls.symbol_in_query = bool(get_setting("symbol_in_query"))
+        cls.storage = get_setting("storage")
         cls.note = Multilingual(text=get_setting("note"))
         cls.name = Multilingual(text=get_setting("name"))
         cls.properties = config  # setting 빼고 나머지는 모두 property임
@@ -100,8 +203,21 @@ class ClientMeta(type):
         # ========= 메서드 구성 =========
         # self 인자로 인스턴스가 주입되도록 함수 객체를 변경
         ins.collect = partial(staticmethod(cls.__class__.collect), ins)
+        ins.parse = partial(staticmethod(cls.__class__.parse), ins)
+        ins.refresh = partial(staticmethod(cls.__class__.refresh), ins)
         ins.zarr_path = partial(staticmethod(cls.__class__.zarr_path), ins)
+        ins.group_path = partial(staticmethod(cls.__class__.group_path), ins)
+        ins.raw_path = partial(staticmethod(cls.__class__.raw_path), ins)
+        ins.open = partial(staticmethod(cls.__class__.open), ins)
+        ins.open_all = partial(staticmethod(cls.__class__.open_all), ins)
+        ins.observe = partial(staticmethod(cls.__class__.observe), ins)
+        ins.save = partial(staticmethod(cls.__class__.save), ins)
+        ins.save_raw = partial(staticmethod(cls.__class__.save_raw), ins)
+        ins.update = partial(staticmethod(cls.__class__.update), ins)
+        ins.migrate = partial(staticmethod(cls.__class__.migrate), ins)
+        ins.mark = partial(staticmethod(cls.__class__.mark), ins)
         ins.loading = partial(staticmethod(cls.__class__.loading), ins)
+        ins.renew = partial(staticmethod(cls.__class__.renew), ins)
         ins.get = partial(staticmethod(cls.__class__.get), ins)
         # ========= Factor 구성 =========
         for name, ele in cls.properties.items():
@@ -123,62 +239,314 @@ class ClientMeta(type):
             raise ValueError(
                 f"FMP에 {self.symbol} symbol에 대한 데이터가 존재하지 않습니다."
             )
-        t = np.array([np.datetime64(day[self.t_key], "ns") for day in series])
-        collected = {}
-        for factor in self.factors:
-            collected[factor] = xr.DataArray(
-                np.array([day.get(factor, np.nan) for day in series], dtype=float),
+        return self.parse(series)
+
+    def parse(self, series: List[dict]) -> Dict[str, xr.DataArray]:
+        """
+        - FMP 시계열 응답(날짜별 레코드 리스트)을 펙터별 DataArray로 변환합니다.
+        - 누락된 데이터는 np.nan으로 대체됩니다.
+        - 레코드를 한번만 순회해서 펙터별 필드를 가진 구조화 배열(structured array)을 만듭니다.
+            날짜 문자열은 NumPy가 한번에 변환합니다.
+        """
+        factors = sorted(self.factors)
+        t = np.array([day[self.t_key] for day in series], dtype="datetime64[ns]")
+        table = np.array(  # 값이 없거나 null이면 nan이 됩니다.
+            [tuple(map(day.get, factors)) for day in series],
+            dtype=[(factor, float) for factor in factors],
+        )
+        return {
+            factor: xr.DataArray(
+                np.ascontiguousarray(table[factor]),
                 dims="t",
                 coords={"t": t},
                 attrs=_xr_meta(element=self.symbol, factor=factor),
             )
+            for factor in factors
+        }
 
-        return collected
+    async def refresh(
+        self, stored: Dict[str, xr.Dataset]
+    ) -> Dict[str, Tuple[xr.Dataset, int | None]] | None:
+        """
+        - 저장된 데이터 이후의 데이터만 수집해서 증분 갱신 내용을 만듭니다.
+        - stored: 저장소에 있는 펙터별 Dataset
+        - return: update 메서드의 updates 인자, 전체 데이터를 다시 수집해야 한다면 None
+            - 빈 딕셔너리라면 저장소에 쓸 내용이 없습니다.
+        - 기본적으로 증분 갱신을 지원하지 않습니다. 지원하는 클라이언트가 재정의합니다.
+        """
+        return None
 
     def zarr_path(self, factor: str) -> PosixPath:
         """
-        - factor에 대한 zarr 경로를 반환합니다.
+        - factor에 대한 zarr 경로를 반환합니다. (factor 레이아웃)
         - 로직상 factor에 대한 경로를 만들어주는거지 해당 경로에 있다는건 아님
         """
         assert factor in self.factors  # use_factors.json를 확인해주세요
         return self.path / f"{factor}.zarr"
 
+    def group_path(self) -> PosixPath:
+        """데이터 클래스의 모든 펙터를 담는 zarr 경로를 반환합니다. (group 레이아웃)"""
+        return self.path.parent / f"{self.path.name}.zarr"
+
+    def raw_path(self) -> PosixPath:
+        """데이터 클래스의 원본 관측값을 담는 zarr 경로를 반환합니다. (raw 저장 형식)"""
+        return self.path.parent / f"{self.path.name}.raw.zarr"
+
+    def open(self, factor: str) -> xr.Dataset | None:
+        """
+        - 저장소에서 factor Dataset(daily, mask)을 엽니다. 저장된 데이터가 없으면 None을 반환합니다.
+        - 모든 저장 형식과 레이아웃을 읽을 수 있으며 raw, group, factor 저장소 순서로 우선합니다.
+            - raw 저장소는 관측값을 보간해서 반환합니다.
+            - 저장소가 교체되는 중이면 교체가 끝나길 기다립니다. (store_path 참고)
+        """
+        if raw_path := store_path(self.raw_path()):
+            raw = xr_open_zarr(raw_path)
+            if factor not in raw:
+                return None
+            key = (str(self.raw_path()), factor, raw.attrs["client"]["collected"])
+            if (dataset := InterpolationCache.get(key)) is None:
+                dataset = interpolation(raw[factor].compute())
+                InterpolationCache.put(key, dataset)
+            return dataset
+        if group_path := store_path(self.group_path()):
+            return _from_group(xr_open_zarr(group_path), factor)
+        if zarr_path := store_path(self.zarr_path(factor)):
+            return xr_open_zarr(zarr_path)
+
+    def open_all(self) -> Dict[str, xr.Dataset]:
+        """저장소에 있는 모든 펙터의 Dataset을 엽니다."""
+        if store_path(self.raw_path()):
+            datasets = {fac: self.open(fac) for fac in self.factors}
+        elif group_path := store_path(self.group_path()):
+            group = xr_open_zarr(group_path)
+            datasets = {fac: _from_group(group, fac) for fac in self.factors}
+        else:
+            datasets = {fac: self.open(fac) for fac in self.factors}
+        return {fac: ds for fac, ds in datasets.items() if ds is not None}
+
+    def observe(self, factor: str, window: slice = slice(None)) -> xr.DataArray | None:
+        """
+        - 저장소에서 factor의 원본 관측값을 읽습니다. 저장된 데이터가 없으면 None을 반환합니다.
+        - window: 읽을 t축 범위 slice(start, end), 범위와 겹치는 청크만 읽습니다.
+        - raw 저장소는 보간하지 않고 그대로 읽습니다.
+        """
+        if raw_path := store_path(self.raw_path()):
+            raw = xr_open_zarr(raw_path)
+            if factor not in raw:
+                return None
+            return raw[factor].sel(t=window).dropna(dim="t").compute()
+        if (dataset := self.open(factor)) is not None:
+            return deinterpolate(dataset.sel(t=window))
+
+    def save_raw(self, collected: Dict[str, xr.DataArray]):
+        """
+        - 수집한 펙터별 원본 관측값들을 하나의 raw 저장소에 저장합니다.
+            - 관측 시점들의 합집합을 t축으로 하며 관측되지 않은 값은 nan입니다.
+        - 유효한 값 갯수가 2개 미만인 펙터는 결측 factor로 취급해서 저장하지 않습니다.
+        - daily 형식의 기존 저장소는 제거합니다.
+        """
+        block = xr.Dataset(collected).drop_duplicates("t").sortby("t")
+        factors = [
+            factor
+            for factor, data_array in block.data_vars.items()
+            if np.count_nonzero(~np.isnan(data_array.values)) >= 2
+        ]
+        block = block[factors].assign_attrs(
+            _xr_meta(element=self.symbol, factor=sorted(factors))
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        xr_to_zarr(dataset=block, path=self.raw_path())
+        shutil.rmtree(self.path, ignore_errors=True)
+        shutil.rmtree(self.group_path(), ignore_errors=True)
+
+    def save(self, datasets: Dict[str, xr.Dataset]):
+        """
+        - 펙터별 Dataset들을 layout 설정에 맞게 daily 형식으로 저장합니다.
+        - 다른 레이아웃이나 raw 형식의 기존 저장소는 제거합니다.
+        """
+        shutil.rmtree(self.raw_path(), ignore_errors=True)
+        if self.__class__.layout == "group":
+            attrs = _xr_meta(element=self.symbol, factor=sorted(datasets))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            xr_to_zarr(dataset=_to_group(datasets, attrs), path=self.group_path())
+            shutil.rmtree(self.path, ignore_errors=True)
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for factor, dataset in datasets.items():
+                xr_to_zarr(dataset=dataset, path=self.zarr_path(factor))
+            shutil.rmtree(self.group_path(), ignore_errors=True)
+
+    def update(
+        self,
+        stored: Dict[str, xr.Dataset],
+        updates: Dict[str, Tuple[xr.Dataset, int | None]],
+    ):
+        """
+        - 증분 갱신 결과를 저장소에 반영합니다.
+        - stored: 저장소에 있는 펙터별 Dataset
+        - updates: 펙터별 (t축의 start 위치부터 교체할 Dataset, start)
+            - start가 None이면 데이터는 그대로 두고 attrs만 갱신합니다.
+        - factor 레이아웃 저장소는 바뀐 부분만 씁니다.
+            group 레이아웃은 펙터들이 저장소를 공유하므로 합친 뒤 다시 저장합니다.
+        """
+        if self.__class__.layout == "factor" and not self.group_path().exists():
+            for factor, (dataset, start) in updates.items():
+                xr_update_zarr(dataset, self.zarr_path(factor), start=start)
+            return
+        datasets = {}
+        for factor, ds in stored.items():
+            dataset, start = updates.get(factor, (xr.Dataset(attrs=ds.attrs), None))
+            if start is not None:
+                head = ds.isel(t=slice(0, start))
+                dataset = xr.concat([head, dataset], dim="t", combine_attrs="override")
+                dataset.attrs = updates[factor][0].attrs
+            else:
+                dataset = ds.assign_attrs(dataset.attrs)
+            # 저장소를 다시 쓰기 전에 모든 데이터를 메모리로 불러와야 합니다.
+            datasets[factor] = dataset.compute()
+        self.save(datasets)
+
+    def migrate(self):
+        """
+        - factor 레이아웃 저장소들을 group 레이아웃 저장소 하나로 옮깁니다.
+        - script/migrate_zarr_layout.py에서 사용합니다.
+        """
+        if not self.path.exists() or self.group_path().exists():
+            return
+        datasets = {
+            fac: xr_open_zarr(self.zarr_path(fac)).compute()
+            for fac in self.factors
+            if self.zarr_path(fac).exists()
+        }
+        attrs = _xr_meta(element=self.symbol, factor=sorted(datasets))
+        if datasets:  # 가장 오래된 수집 날짜를 저장소의 수집 날짜로 사용
+            collected = min(_collected_date(ds) for ds in datasets.values())
+            attrs["client"]["collected"] = collected.strftime("%Y-%m-%d")
+        xr_to_zarr(dataset=_to_group(datasets, attrs), path=self.group_path())
+        shutil.rmtree(self.path)
+
+    async def mark(self):
+        """
+        - 저장소 상태(수집 날짜, t축 길이, 마지막 t)를 FreshnessIndex에 기록합니다.
+        - 저장소 쓰기가 끝난 뒤 호출하며 실제로 저장된 내용을 기준으로 기록합니다.
+        """
+        if self.raw_path().exists():  # raw 저장소는 보간하지 않고 메타데이터만 읽습니다.
+            datasets = {"raw": await zarr_io(xr_open_zarr, self.raw_path())}
+        elif not (datasets := await zarr_io(self.open_all)):
+            return
+        last_t = max(ds.t.values[-1] for ds in datasets.values())
+        await FreshnessIndex.set(
+            self.symbol,
+            self.__class__.__name__,
+            collected=max(map(_collected_date, datasets.values())).isoformat(),
+            rows=max(ds.sizes["t"] for ds in datasets.values()),
+            last_t=np.datetime_as_string(last_t, unit="D").item(),
+        )
+
     async def loading(self):
-        """zarr 저장소에 최신 데이터가 존재하도록 합니다."""
-
-        for fac in self.factors:  # 데이터 갱신 여부 확인
-            if self.zarr_path(fac).exists():
-                array = xr_open_zarr(self.zarr_path(fac))
-                collected_date = datetime.strptime(
-                    array.attrs["client"]["collected"], "%Y-%m-%d"
-                ).date()
-                if collected_date == date.today():
-                    return  # 데이터 갱신 필요 없음
+        """
+        - zarr 저장소에 최신 데이터가 존재하도록 합니다.
+        - 갱신은 RefreshLock을 잡은 워커 하나만 합니다.
+            - 다른 워커는 이전 버전의 데이터가 있으면 그대로 사용하고 없으면 갱신이 끝나길 기다립니다.
+        """
+        today = date.today()
+        section = self.__class__.__name__
+        entry = await FreshnessIndex.get(self.symbol, section)
+        if entry and entry["collected"] == today.isoformat():
+            return  # 저장소를 열지 않고 갱신 필요 없음을 확인
+
+        async with RefreshLock(self.symbol, section) as lock:
+            if lock.acquired:
+                return await self.renew(lock)
+            stores = [self.raw_path(), self.group_path(), self.path]
+            if not any([await zarr_io(store_path, store) for store in stores]):
+                await lock.wait()  # 제공할 이전 버전이 없음
+
+    async def renew(self, lock: RefreshLock):
+        """loading에서 RefreshLock을 잡은 뒤 저장소를 갱신합니다."""
+        today = date.today()
+        # 인덱스에 기록이 없거나 Redis를 쓸 수 없으면 저장소를 직접 확인합니다.
+        if self.raw_path().exists():  # raw 저장소는 증분 갱신하지 않습니다.
+            if _collected_date(await zarr_io(xr_open_zarr, self.raw_path())) == today:
+                return await self.mark()  # 데이터 갱신 필요 없음
+            stored = {}
+        elif self.group_path().exists():  # group 레이아웃은 메타데이터를 한번만 읽습니다.
+            if _collected_date(await zarr_io(xr_open_zarr, self.group_path())) == today:
+                return await self.mark()  # 데이터 갱신 필요 없음
+            stored = await zarr_io(self.open_all)
+        else:
+            stored = {}
+            for fac in self.factors:  # 데이터 갱신 여부 확인
+                if self.zarr_path(fac).exists():
+                    array = await zarr_io(xr_open_zarr, self.zarr_path(fac))
+                    if _collected_date(array) == today:
+                        return await self.mark()  # 데이터 갱신 필요 없음
+                    stored[fac] = array
+        if stored and (updates := await self.refresh(stored)) is not None:
+            if updates and await lock.held():
+                await zarr_io(self.update, stored, updates)
+            return await self.mark()  # 증분 갱신 완료
         try:
             collected = await self.collect()
         except (HTTPStatusError, ValueError):
             return  # 데이터를 가져올 수 없거나 데이터가 비었으면 아무것도 안함
+        if not await lock.held():
+            return  # lease가 만료되어 다른 워커가 갱신을 맡았음
 
-        self.path.mkdir(parents=True, exist_ok=True)
-        for factor, data_array in collected.items():
-            if np.count_nonzero(~np.isnan(data_array.values)) < 2:
-                continue  # 유효한 값 갯수가 2개 미만이면 결측 factor로 취급
-            xr_to_zarr(dataset=interpolation(data_array), path=self.zarr_path(factor))
+        if self.__class__.storage == "raw":
+            await zarr_io(self.save_raw, collected)
+            return await self.mark()
+        # 모든 펙터를 한번에 보간합니다. 유효한 값 갯수가 2개 미만인 펙터는 결측 factor로 취급
+        block = batch_interpolation(xr.Dataset(collected))
+        await zarr_io(
+            self.save,
+            {
+                factor: _from_group(block, factor)
+                for factor in collected
+                if factor in block
+            },
+        )
+        await self.mark()
 
-    async def get(self, factor: str, default=None) -> xr.Dataset | None:
-        """factor Dataset을 반환합니다. 데이터가 없는 경우 default를 반환합니다."""
+    async def get(
+        self,
+        factor: str,
+        default=None,
+        interpolate: bool = True,
+        start: str | date | None = None,
+        end: str | date | None = None,
+    ) -> xr.Dataset | xr.DataArray | None:
+        """
+        - factor 데이터를 반환합니다. 데이터가 없는 경우 default를 반환합니다.
+        - interpolate: Default[True]
+            - True인 경우 일별로 보간된 Dataset(daily, mask)을 반환합니다.
+                - 저장소에서 아직 읽지 않은(lazy) Dataset일 수 있습니다.
+            - False인 경우 원본 관측값 DataArray를 반환합니다.
+                raw 저장소는 보간하지 않으므로 훨씬 빠릅니다.
+        - start, end: 반환할 t축 범위 (양 끝 포함), 범위와 겹치는 청크만 읽습니다.
+        """
         assert factor in self.factors  # JSON에 정의되지 않은 Factor입니다.
         await self.loading()
-        return (
-            xr_open_zarr(self.zarr_path(factor))
-            if self.zarr_path(factor).exists()
-            else default
-        )
+        window = slice(*(np.datetime64(v, "D") if v else None for v in (start, end)))
+        if interpolate:
+            data = await zarr_io(self.open, factor)
+            data = data.sel(t=window) if data is not None else None
+        else:
+            data = await zarr_io(self.observe, factor, window)
+        return data if data is not None else default
 
 
 class HistoricalPriceFullMeta(ClientMeta):
     """api/v3/historical-price-full API 전용 클라이언트"""
 
+    # 일별 데이터라 raw 형식으로 줄어드는 양이 적고, 증분 갱신(refresh)은 daily 형식에서만 동작합니다.
+    # 따라서 이 메타클래스를 쓰는 데이터 클래스는 JSON setting에 storage를 지정하지 않습니다.
+
+    # 증분 갱신 시 저장된 마지막 날짜 이전 overlap_days일 부터 다시 수집합니다.
+    # 겹치는 구간의 값이 저장된 값과 다르면 과거 데이터가 수정(액면분할 등)된 것으로 보고 전체를 다시 수집합니다.
+    # 저장된 마지막 관측값은 장중에 수집되어 이후 확정값으로 바뀌는 경우가 많으므로 비교하지 않고 덮어씁니다.
+    overlap_days = 14
+
     async def collect(self):  # collect 메서드 재정의
         # FMP 서버는 안정적인 응답 시간을 위해 from 인자가 없다면 기본적으로 5년 전까지의 데이터만 수신합니다.
         # from 인자로 "1900-01-01" 를 넣어서 모든 데이터를 가져올 수 있습니다.(이렇게 하라고 FMP한테 확인받음)
@@ -191,17 +559,70 @@ class HistoricalPriceFullMeta(ClientMeta):
             raise ValueError(
                 f"FMP에 {self.symbol} symbol에 대한 데이터가 존재하지 않습니다."
             )
+        return self.parse(series)
 
-        # 나머지는 부모클래스 코드와 동일
-        t = np.array([np.datetime64(day[self.t_key], "ns") for day in series])
-        collected = {}
+    async def refresh(self, stored: Dict[str, xr.Dataset]):  # 증분 갱신 구현
+        last_t = min(ds.t.values[-1] for ds in stored.values())
+        since = last_t - np.timedelta64(self.__class__.overlap_days, "D")
+        data: dict = await FmpAPI(cache=False).get(
+            path=self.api,
+            **self.api_params | {"from": np.datetime_as_string(since, unit="D")},
+        )
+        if data is None:
+            return {}  # 통신 실패, 다음 요청에서 다시 시도합니다.
+        if not (series := data.get("historical")):
+            series = []  # 새로운 데이터가 없음
 
-        for factor in self.factors:
-            collected[factor] = xr.DataArray(
-                np.array([day[factor] for day in series], dtype=float),
-                dims="t",
-                coords={"t": t},
-                attrs=_xr_meta(element=self.symbol, factor=factor),
-            )
+        updates = {}
+        for factor, new in (self.parse(series) if series else {}).items():
+            new = new.dropna(dim="t").drop_duplicates("t").sortby("t")
+            if factor not in stored:
+                if new.size:  # 저장되지 않았던 펙터에 값이 생겼으므로 전체 수집이 필요함
+                    return None
+                continue
+            ds = stored[factor]
+            last = ds.t.values[-1]
+            # 마지막 관측값은 장중에 수집된 값일 수 있으므로 비교하지 않고 새 값으로 덮어씁니다.
+            old = deinterpolate(ds.sel(t=slice(since, None)))
+            old, overlap = old.sel(t=old.t < last), new.sel(t=new.t < last)
+            if not (
+                np.array_equal(overlap.t.values, old.t.values)
+                and np.allclose(overlap.values, old.values, rtol=1e-6)
+            ):
+                return None  # 과거 데이터가 수정되었음
+            if not (appended := new.sel(t=new.t >= last)).size:
+                continue
+            if appended.t.values[0] != last:
+                return None  # 마지막 관측값이 사라졌음
+            if appended.size > 1 or appended.values[0] != ds.daily.values[-1]:
+                updates[factor] = appended
+
+        collected_date = datetime.now().strftime("%Y-%m-%d")
+        windows = {}
+        for factor, ds in stored.items():
+            attrs = copy.deepcopy(ds.attrs)
+            attrs["client"]["collected"] = collected_date
+            if factor not in updates:  # 수집일만 갱신
+                windows[factor] = (xr.Dataset(attrs=attrs), None)
+                continue
+            # PCHIP 보간은 이웃한 관측값들에만 의존하므로 마지막 관측값 몇 개와 새로운 관측값만으로
+            # 끝부분을 다시 보간하면 전체를 다시 보간한 것과 같은 결과를 얻습니다.
+            # 마지막 관측값은 updates의 값으로 바뀌므로 그 이전 관측값들을 사용합니다.
+            tail = deinterpolate(ds.isel(t=slice(-365, None)))
+            tail = tail.sel(t=tail.t < updates[factor].t.values[0])[-4:]
+            if tail.size < 2:
+                return None
+            observations = xr.concat([tail, updates[factor]], dim="t")
+            window = interpolation(observations.assign_attrs(attrs))
+            start = tail.t.values[-2]  # 이 시점부터의 보간값이 바뀝니다.
+            window = window.sel(t=slice(start, None))
 
-        return collected
+            # 보간 비율 메타데이터는 전체 구간에 대해 다시 계산합니다.
+            day = np.timedelta64(1, "D")
+            ratio = attrs["normalize"]["interpolation"]["ratio"]
+            # updates의 첫 값은 저장된 마지막 관측값을 덮어쓰므로 관측값 수는 하나 적게 늘어납니다.
+            observed = (1 - ratio) * ds.sizes["t"] + updates[factor].size - 1
+            total = int((window.t.values[-1] - ds.t.values[0]) / day) + 1
+            window.attrs["normalize"]["interpolation"]["ratio"] = 1 - observed / total
+            windows[factor] = (window, int((start - ds.t.values[0]) / day))
+        return windows
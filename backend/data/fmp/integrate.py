@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import json
+import time
 import asyncio
-from typing import List
+from typing import List, Dict, Tuple
 
 import pycountry
 from aiocache import cached
@@ -52,6 +53,92 @@ HistoricalPrice = create_class("HistoricalPrice")
 # =====================================================================
 
 
+def _info_cache_key(code: str) -> str:
+    """
+    - Symbol.get_info의 캐시 키
+    - 기존 캐시 항목을 그대로 쓸 수 있도록 aiocache의 기본 키 형식과 동일하게 만듭니다.
+    """
+    return f"{__name__}get_info(<Symbol: {code}>,)[]"
+
+
+def _parse_info(code: str, profile: dict = None, search_resp: list = None) -> dict:
+    """
+    - api/v3/profile 응답 항목과 api/v3/search 응답으로 Symbol의 name과 note를 만듭니다.
+    - profile 정보가 우선이며, 없는 경우 search 응답에서 code와 일치하는 항목을 사용합니다.
+    """
+    name = exchange = currency = description = None
+    if profile:
+        name = profile["companyName"]
+        exchange = profile["exchange"]
+        currency = profile["currency"]
+        description = profile["description"]
+    elif search_resp:
+        if matched := [ele for ele in search_resp if ele["symbol"] == code]:
+            name = matched[0]["name"]
+            exchange = matched[0]["stockExchange"]
+            currency = matched[0]["currency"]
+
+    # ======= 수집된 데이터 정제 =======
+    currency_obj = pycountry.currencies.get(alpha_3=currency) if currency else None
+    if name and exchange and currency_obj:  # 이 3가지 정보는 필수
+        note_basic = f"{name}({code}) is traded at {exchange} and the currency uses {currency_obj.name}. "
+        note = f"{note_basic} {description}" if description else note_basic
+        return {"name": name, "note": note}
+    return {"name": name, "note": None}  # name은 None일 수도 있음
+
+
+class QuoteSnapshot:
+    """
+    - api/v3/quote
+    - 여러 symbol의 시세를 한번의 요청으로 가져오고 짧은 시간(ttl) 동안 프로세스 메모리에 캐싱합니다.
+    - Symbol의 current_price, current_volume, current_change가 같은 시세 레코드를 공유합니다.
+    """
+
+    ttl = 15  # 시세 캐시 유지 시간(초)
+    chunk_size = 50  # quote API 요청 한번에 묶을 symbol 수
+    max_size = 10_000  # 캐시 크기가 이보다 커지면 만료된 항목을 정리합니다.
+    _cache: Dict[str, Tuple[float, dict]] = {}  # code -> (수집 시각, 시세 레코드)
+
+    @classmethod
+    async def get_many(cls, codes: List[str]) -> Dict[str, dict]:
+        """
+        - return: code를 키로 하는 시세 레코드 딕셔너리
+            - 시세가 없는 symbol은 빈 딕셔너리입니다.
+        """
+        now = time.monotonic()
+        fresh = lambda code: (
+            code in cls._cache and now - cls._cache[code][0] < cls.ttl
+        )
+        if missing := [code for code in dict.fromkeys(codes) if not fresh(code)]:
+            chunks = [
+                missing[i : i + cls.chunk_size]
+                for i in range(0, len(missing), cls.chunk_size)
+            ]
+            responses = await asyncio.gather(
+                *[
+                    FmpAPI(cache=False).get(f"api/v3/quote/{','.join(chunk)}")
+                    for chunk in chunks
+                ]
+            )
+            if len(cls._cache) > cls.max_size:
+                cls._cache = {c: v for c, v in cls._cache.items() if fresh(c)}
+            received = {
+                record["symbol"]: record for resp in responses for record in resp or []
+            }
+            for code, record in received.items():
+                cls._cache[code] = (now, record)
+            # 요청이 실패했거나 응답에 없는 symbol은 만료된 이전 시세를 현재 시세처럼 제공하지 않도록
+            # 빈 레코드로 덮어쓰고 ttl 동안 다시 요청하지 않습니다.
+            for code in missing:
+                if code not in received:
+                    cls._cache[code] = (now, {})
+        return {code: cls._cache.get(code, (now, {}))[1] for code in codes}
+
+    @classmethod
+    async def get(cls, code: str) -> dict:
+        return (await cls.get_many([code]))[code]
+
+
 class Symbol:
     attr_name = {  # 펙터 클래스에 대한 속성 이름
         "HistoricalPrice": "price",
@@ -78,6 +165,7 @@ class Symbol:
         "CotReport": "cot_report",
         "AnalystEstimates": "analyst_estimates",
     }
+    profile_chunk_size = 50  # load_many에서 profile API 요청 한번에 묶을 symbol 수
 
     def __init__(self, code: str):
         """
@@ -163,7 +251,71 @@ class Symbol:
             raise ElementDoesNotExist(f"[code: {self.code}]")
         return self
 
-    @cached(cache=ElasticRedisCache, ttl=CacheTTL.MAX)
+    @classmethod
+    async def load_many(cls, codes: List[str], strict: bool = True) -> List[Symbol]:
+        """
+        - 여러 Symbol을 한번에 load합니다.
+        - api/v3/profile API에 여러 symbol을 콤마로 묶어서 요청하고 get_info 캐시를 한번에 채웁니다.
+            - profile에 없는 symbol만 하나씩 api/v3/search로 검색합니다.
+        - strict: Default[True]
+            - True인 경우 존재하지 않는 symbol이 있으면 load와 같이 ElementDoesNotExist를 raise합니다.
+            - False인 경우 존재하지 않는 symbol은 결과에서 제외합니다.
+        - return: 입력된 codes 순서대로 load된 Symbol 리스트 (중복 제거)
+        """
+        if not (codes := list(dict.fromkeys(codes))):
+            return []
+        cache = ElasticRedisCache()
+        cached_infos = await cache.multi_get([_info_cache_key(code) for code in codes])
+        infos = {
+            code: info for code, info in zip(codes, cached_infos) if info is not None
+        }
+
+        if missing := [code for code in codes if code not in infos]:
+            chunks = [
+                missing[i : i + cls.profile_chunk_size]
+                for i in range(0, len(missing), cls.profile_chunk_size)
+            ]
+            responses = await asyncio.gather(
+                *[
+                    FmpAPI(cache=False).get(f"api/v3/profile/{','.join(chunk)}")
+                    for chunk in chunks
+                ]
+            )
+            profiles = {
+                profile["symbol"]: profile
+                for resp in responses
+                for profile in resp or []
+            }
+
+            async def collect(code):
+                if profile := profiles.get(code):
+                    return _parse_info(code, profile=profile)
+                search_resp = await FmpAPI(cache=False).get("api/v3/search", query=code)
+                return _parse_info(code, search_resp=search_resp)
+
+            collected = dict(zip(missing, await asyncio.gather(*map(collect, missing))))
+            await cache.multi_set(
+                [(_info_cache_key(code), info) for code, info in collected.items()],
+                ttl=CacheTTL.MAX,
+            )
+            infos |= collected
+
+        symbols = []
+        for code in codes:
+            symbol = cls(code)
+            symbol.info = infos[code]
+            if symbol.info["name"] and symbol.info["note"]:
+                symbol.is_loaded = True
+                symbols.append(symbol)
+            elif strict:
+                raise ElementDoesNotExist(f"[code: {code}]")
+        return symbols
+
+    @cached(
+        cache=ElasticRedisCache,
+        ttl=CacheTTL.MAX,
+        key_builder=lambda _func, self: _info_cache_key(self.code),
+    )
     async def get_info(self):
         """
         - name과 note정보를 수집해서 정제한 뒤 반환합니다.
@@ -175,30 +327,11 @@ class Symbol:
             FmpAPI(cache=False).get(f"api/v3/profile/{self.code}"),
             FmpAPI(cache=False).get("api/v3/search", query=self.code),
         )
-
-        name = exchange = currency = description = None
-        if profile_resp:
-            name = profile_resp[0]["companyName"]
-            exchange = profile_resp[0]["exchange"]
-            currency = profile_resp[0]["currency"]
-            description = profile_resp[0]["description"]
-        elif search_api_resp:
-            if matched := [
-                ele for ele in search_api_resp if ele["symbol"] == self.code
-            ]:
-                name = matched[0]["name"]
-                exchange = matched[0]["stockExchange"]
-                currency = matched[0]["currency"]
-
-        # ======= 수집된 데이터 정제 =======
-        currency_obj = pycountry.currencies.get(alpha_3=currency) if currency else None
-        if name and exchange and currency_obj:  # 이 3가지 정보는 필수
-            note_basic = f"{name}({self.code}) is traded at {exchange} and the currency uses {currency_obj.name}. "
-            note = f"{note_basic} {description}" if description else note_basic
-            info = {"name": name, "note": note}
-        else:
-            info = {"name": name, "note": None}  # name은 None일 수도 있음
-        return info
+        return _parse_info(
+            self.code,
+            profile=profile_resp[0] if profile_resp else None,
+            search_resp=search_api_resp,
+        )
 
     @property
     def name(self):
@@ -224,15 +357,19 @@ class Symbol:
         resp = await FmpAPI(cache=True).get("api/v4/stock_peers", symbol=self.code)
         return self._from_list(resp[0]["peersList"]) if resp else []
 
+    async def _quote(self, key: str) -> int | float | None:
+        """QuoteSnapshot 시세 레코드에서 숫자 값을 꺼냅니다."""
+        quote = await QuoteSnapshot.get(self.code)
+        if isinstance(value := quote.get(key), (int, float)):
+            return value
+
     @property
     async def current_price(self) -> int | float | None:
         """
         - api/v3/quote
         - 현재 가격
         """
-        resp = await FmpAPI(cache=False).get(f"api/v3/quote-short/{self.code}")
-        if resp and isinstance(value := resp[0].get("price"), (int, float)):
-            return value
+        return await self._quote("price")
 
     @property
     async def current_volume(self) -> int | float | None:
@@ -240,9 +377,7 @@ class Symbol:
         - api/v3/quote
         - 현재 거래량
         """
-        resp = await FmpAPI(cache=False).get(f"api/v3/quote-short/{self.code}")
-        if resp and isinstance(value := resp[0].get("volume"), (int, float)):
-            return value
+        return await self._quote("volume")
 
     @property
     async def current_change(self) -> int | float | None:
@@ -250,9 +385,7 @@ class Symbol:
         - api/v3/quote
         - 현재 가격 변화율 (%)
         """
-        resp = await FmpAPI(cache=False).get(f"api/v3/quote/{self.code}")
-        if resp and isinstance(value := resp[0].get("changesPercentage"), (int, float)):
-            return value
+        return await self._quote("changesPercentage")
 
 
 async def search(text: str, limit: int = 8) -> List[Symbol]:
@@ -278,21 +411,11 @@ async def search(text: str, limit: int = 8) -> List[Symbol]:
         else list(resp_set)[:limit]
     )
 
-    async def load(code):
-        try:
-            return await Symbol(code).load()
-        except ElementDoesNotExist:
-            return None
-
-    load_results = await asyncio.gather(*[load(code) for code in codes])
-    symbols = [result for result in load_results if result is not None]
-
-    async def current_volume(symbol):
-        return await symbol.current_volume or 0
+    symbols = await Symbol.load_many(codes, strict=False)
 
-    # 거래량 기준으로 정렬합니다.
-    volume_list = await asyncio.gather(*map(current_volume, symbols))
-    volume_map = dict(zip(symbols, volume_list))
+    # 거래량 기준으로 정렬합니다. 모든 symbol의 시세를 한번에 가져옵니다.
+    quotes = await QuoteSnapshot.get_many([sym.code for sym in symbols])
+    volume_map = {sym: quotes[sym.code].get("volume") or 0 for sym in symbols}
     sorted_list = sorted(symbols, key=lambda sym: volume_map[sym], reverse=True)
 
     return sorted(  # 검색어와 매칭되는 symbol들을 앞으로 옮깁니다
@@ -354,7 +477,7 @@ async def cond_search(
         ("limit", limit),
     )
     resp = await FmpAPI(cache=False).get("api/v3/stock-screener", **params)
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 cond_search.params = {
@@ -396,7 +519,7 @@ async def list_gainers() -> List[Symbol]:
     - 급상승 종목들
     """
     resp = await FmpAPI(cache=False).get("api/v3/stock_market/gainers")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_losers() -> List[Symbol]:
@@ -405,7 +528,7 @@ async def list_losers() -> List[Symbol]:
     - 급하락 종목들
     """
     resp = await FmpAPI(cache=False).get("api/v3/stock_market/losers")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_actives() -> List[Symbol]:
@@ -414,7 +537,7 @@ async def list_actives() -> List[Symbol]:
     - 현재 거래량이 가장 많은 종목들
     """
     resp = await FmpAPI(cache=False).get("api/v3/stock_market/actives")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_all() -> List[Symbol]:
@@ -425,13 +548,13 @@ async def list_all() -> List[Symbol]:
     - 리스트 길이: 약 7만개
     """
     resp = await FmpAPI(cache=False).get("api/v3/stock/list")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_cot() -> List[Symbol]:
     """api/v4/commitment_of_traders_report/list"""
     resp = await FmpAPI(cache=False).get("api/v4/commitment_of_traders_report/list")
-    return await asyncio.gather(*(Symbol(ele["trading_symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["trading_symbol"] for ele in resp])
 
 
 async def list_tradable() -> List[Symbol]:
@@ -441,64 +564,64 @@ async def list_tradable() -> List[Symbol]:
     - 리스트 길이: 약 5만 3천개
     """
     resp = await FmpAPI(cache=False).get("api/v3/available-traded/list")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_etf() -> List[Symbol]:
     """api/v3/etf/list"""
     resp = await FmpAPI(cache=False).get("api/v3/etf/list")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_sp500() -> List[Symbol]:
     """api/v3/sp500_constituent"""
     resp = await FmpAPI(cache=False).get("api/v3/sp500_constituent")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_nasdaq() -> List[Symbol]:
     """api/v3/nasdaq_constituent"""
     resp = await FmpAPI(cache=False).get("api/v3/nasdaq_constituent")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_dowjones() -> List[Symbol]:
     """api/v3/dowjones_constituent"""
     resp = await FmpAPI(cache=False).get("api/v3/dowjones_constituent")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_index() -> List[Symbol]:
     """api/v3/symbol/available-indexes"""
     resp = await FmpAPI(cache=False).get("api/v3/symbol/available-indexes")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_euronext() -> List[Symbol]:
     """api/v3/symbol/available-euronext"""
     resp = await FmpAPI(cache=False).get("api/v3/symbol/available-euronext")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_tsx() -> List[Symbol]:
     """api/v3/symbol/available-tsx"""
     resp = await FmpAPI(cache=False).get("api/v3/symbol/available-tsx")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_crypto() -> List[Symbol]:
     """api/v3/symbol/available-cryptocurrencies"""
     resp = await FmpAPI(cache=False).get("api/v3/symbol/available-cryptocurrencies")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_forex() -> List[Symbol]:
     """api/v3/symbol/available-forex-currency-pairs"""
     resp = await FmpAPI(cache=False).get("api/v3/symbol/available-forex-currency-pairs")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
 
 
 async def list_commodity() -> List[Symbol]:
     """api/v3/symbol/available-commodities"""
     resp = await FmpAPI(cache=False).get("api/v3/symbol/available-commodities")
-    return await asyncio.gather(*(Symbol(ele["symbol"]).load() for ele in resp))
+    return await Symbol.load_many([ele["symbol"] for ele in resp])
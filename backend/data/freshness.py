@@ -0,0 +1,159 @@
+""" zarr 저장소 갱신 조정 (갱신 상태 인덱스, 워커 간 갱신 잠금) """
+
+import json
+import time
+import asyncio
+from datetime import date
+from collections import OrderedDict
+
+import redis.asyncio as redis
+
+from backend.system import REDIS_CONFIG, CacheTTL, log
+
+
+class FreshnessIndex:
+    """
+    - 저장소를 열지 않고도 갱신 필요 여부를 알 수 있도록 저장소 상태를 Redis에 기록합니다.
+        - Hash 키: freshness:{element}, 필드: {section} (데이터 클래스 이름)
+        - 값: {"collected": 수집 날짜, "rows": t축 길이, "last_t": 마지막 t}
+    - Redis 앞에 프로세스 내 LRU 캐시를 둡니다.
+        - 오늘 수집된 항목만 LRU 캐시에서 바로 응답합니다.
+        - 오래된 항목은 다른 워커가 갱신했을 수 있으므로 Redis를 다시 확인합니다.
+    - 저장소 쓰기를 마친 쪽이 set으로 갱신합니다.
+    - Redis에 문제가 있으면 None을 반환하므로 호출자는 저장소를 직접 확인해야 합니다.
+    """
+
+    key_prefix = "freshness"
+    expire = CacheTTL.MID
+    max_size = 4096  # LRU 캐시 최대 항목 수
+    cache = redis.Redis(**REDIS_CONFIG)
+    _lru: OrderedDict = OrderedDict()
+
+    @classmethod
+    def _remember(cls, key: tuple, entry: dict):
+        cls._lru[key] = entry
+        cls._lru.move_to_end(key)
+        if len(cls._lru) > cls.max_size:
+            cls._lru.popitem(last=False)
+
+    @classmethod
+    async def get(cls, element: str, section: str) -> dict | None:
+        """저장소 상태를 반환합니다. 기록이 없으면 None을 반환합니다."""
+        key = (element, section)
+        entry = cls._lru.get(key)
+        if entry and entry["collected"] == date.today().isoformat():
+            cls._lru.move_to_end(key)
+            return entry
+        try:
+            value = await cls.cache.hget(f"{cls.key_prefix}:{element}", section)
+        except redis.RedisError as e:
+            log.warning(f"[FreshnessIndex] Redis 조회 실패 ({element}/{section}): {e}")
+            return None
+        if value is None:
+            return None
+        cls._remember(key, entry := json.loads(value))
+        return entry
+
+    @classmethod
+    async def set(
+        cls, element: str, section: str, collected: str, rows: int, last_t: str | None
+    ):
+        """저장소 상태를 기록합니다."""
+        entry = {"collected": collected, "rows": rows, "last_t": last_t}
+        key = f"{cls.key_prefix}:{element}"
+        try:
+            async with cls.cache.pipeline(transaction=True) as pipe:
+                await pipe.hset(key, section, json.dumps(entry))
+                await pipe.expire(key, cls.expire)
+                await pipe.execute()
+        except redis.RedisError as e:
+            log.warning(f"[FreshnessIndex] Redis 기록 실패 ({element}/{section}): {e}")
+        cls._remember((element, section), entry)
+
+
+class RefreshLock:
+    """
+    - 여러 워커(컨테이너)가 같은 저장소를 동시에 갱신하지 않도록 하는 Redis 잠금입니다.
+        - SET NX PX로 lease 동안만 유효한 잠금을 잡습니다. 워커가 죽어도 lease가 지나면 풀립니다.
+        - 잠금 값은 INCR로 발급한 펜싱 토큰입니다. 저장소에 쓰기 전에 held로 잠금을 아직
+            보유하고 있는지 확인합니다. lease가 만료되어 다른 워커가 잠금을 가져갔다면 쓰지 않습니다.
+    - Redis를 쓸 수 없으면 잠금 없이 진행합니다. (acquired=True, token=None)
+    ```python
+    async with RefreshLock(symbol, section) as lock:
+        if not lock.acquired:
+            await lock.wait()  # 또는 이전 버전의 데이터를 제공
+        ...
+        if await lock.held():
+            ...  # 저장소 쓰기
+    ```
+    """
+
+    key_prefix = "refresh-lock"
+    lease = 300  # 잠금 유효 시간(초), 전체 수집 + 저장 시간보다 충분히 길어야 합니다.
+    poll_interval = 0.2  # wait에서 잠금 해제를 확인하는 간격(초)
+    cache = redis.Redis(**REDIS_CONFIG)
+    # 토큰이 일치할 때만 잠금을 해제합니다. (다른 워커의 잠금을 풀지 않도록)
+    release_script = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+    # 잠금 값이 토큰과 같은지 Redis 안에서 비교합니다.
+    # REDIS_CONFIG는 connection_pool을 넘기므로 decode_responses가 적용되지 않아 GET은 bytes를
+    # 반환합니다. 응답 타입과 관계없이 비교하기 위해 스크립트를 사용합니다.
+    held_script = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, element: str, section: str):
+        self.key = f"{self.key_prefix}:{element}:{section}"
+        self.token: int | None = None
+        self.acquired = False
+
+    async def __aenter__(self):
+        try:
+            async with self.cache.pipeline(transaction=True) as pipe:
+                await pipe.incr(f"{self.key}:fence")
+                await pipe.expire(f"{self.key}:fence", CacheTTL.MID)
+                self.token, _ = await pipe.execute()
+            self.acquired = bool(
+                await self.cache.set(self.key, self.token, nx=True, ex=self.lease)
+            )
+        except redis.RedisError as e:
+            log.warning(f"[RefreshLock] 잠금 없이 진행합니다 ({self.key}): {e}")
+            self.token, self.acquired = None, True
+        return self
+
+    async def __aexit__(self, *_):
+        if not self.acquired or self.token is None:
+            return
+        try:
+            await self.cache.eval(self.release_script, 1, self.key, self.token)
+        except redis.RedisError:
+            pass  # lease가 지나면 풀립니다.
+
+    async def held(self) -> bool:
+        """잠금을 아직 보유하고 있는지 확인합니다."""
+        if not self.acquired:
+            return False
+        if self.token is None:
+            return True  # 잠금 없이 진행하는 중
+        try:
+            return bool(await self.cache.eval(self.held_script, 1, self.key, self.token))
+        except redis.RedisError:
+            return True
+
+    async def wait(self):
+        """잠금을 가진 워커의 갱신이 끝날 때까지 기다립니다. (최대 lease초)"""
+        deadline = time.monotonic() + self.lease
+        while time.monotonic() < deadline:
+            try:
+                if not await self.cache.exists(self.key):
+                    return
+            except redis.RedisError:
+                return
+            await asyncio.sleep(self.poll_interval)
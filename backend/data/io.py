@@ -1,21 +1,93 @@
 import time
+import uuid
+import random
+import shutil
+import asyncio
+import threading
 from pathlib import Path
 from typing import Callable
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
+import zarr
 import xarray as xr
 
 EFS_TIMEOUT = 8
+BACKOFF_BASE = 0.01  # 첫 재시도 대기 시간 상한(초), 재시도마다 두배
+BACKOFF_CAP = 0.5  # 재시도 대기 시간 상한(초)
+IO_WORKERS = 16  # zarr I/O 전용 스레드 수
+COMPUTE_WORKERS = 4  # 계산, 직렬화 전용 스레드 수
+T_CHUNK = 1024  # t축 청크 크기, 범위를 읽을 때 겹치는 청크만 읽습니다.
+
+# 이벤트 루프를 막지 않도록 zarr I/O는 전용 스레드 풀에서 실행합니다.
+# 크기가 제한되어 있으므로 EFS가 느려져도 스레드가 무한정 늘어나지 않습니다.
+executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="zarr-io")
+# 계산과 직렬화(Dataset compute, xlsx 인코딩 등)는 별도의 스레드 풀에서 실행합니다.
+# 큰 작업이 zarr I/O 스레드를 모두 차지해서 저장소 읽기가 멈추지 않도록 합니다.
+compute_executor = ThreadPoolExecutor(
+    max_workers=COMPUTE_WORKERS, thread_name_prefix="compute"
+)
+
+# _pooling 호출 통계 (calls: 호출 수, retries: 재시도 수, failures: 최종 실패 수,
+# seconds: 누적 소요 시간, slowest: 가장 오래 걸린 호출 시간)
+metrics = {"calls": 0, "retries": 0, "failures": 0, "seconds": 0.0, "slowest": 0.0}
+_metrics_lock = threading.Lock()
+
+
+def _record(retries: int, seconds: float, failed: bool):
+    with _metrics_lock:
+        metrics["calls"] += 1
+        metrics["retries"] += retries
+        metrics["failures"] += failed
+        metrics["seconds"] += seconds
+        metrics["slowest"] = max(metrics["slowest"], seconds)
 
 
 def _pooling(callable: Callable):
+    """
+    - EFS 동시성 문제로 실패하는 I/O를 EFS_TIMEOUT초 동안 재시도합니다.
+    - 재시도 간격은 지수적으로 늘어나며 무작위로 흩어집니다. (full jitter)
+        같은 저장소를 기다리는 호출들이 동시에 다시 몰리지 않습니다.
+    - 대기하는 동안 스레드를 잠재우므로 CPU를 점유하지 않습니다.
+    """
     start = time.time()
+    retries = 0
     while time.time() - start < EFS_TIMEOUT:
         try:
-            return callable()
+            result = callable()
+            _record(retries, time.time() - start, failed=False)
+            return result
         except:
-            pass
-    return callable()  # timeout동안 계속 시도했음에도 에러가 반복되는 상황이다.
+            delay = min(BACKOFF_CAP, BACKOFF_BASE * 2**retries)
+            retries += 1
+            time.sleep(random.uniform(0, delay))
+    try:  # timeout동안 계속 시도했음에도 에러가 반복되는 상황이다.
+        result = callable()
+    except:
+        _record(retries, time.time() - start, failed=True)
+        raise
+    _record(retries, time.time() - start, failed=False)
+    return result
+
+
+async def zarr_io(func: Callable, *args, **kwargs):
+    """
+    - zarr I/O를 하는 동기 함수를 전용 스레드 풀에서 실행합니다.
+    - 비동기 함수에서 xr_open_zarr, xr_to_zarr 등을 호출할 때 사용하세요.
+        `dataset = await zarr_io(xr_open_zarr, path)`
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+async def compute_io(func: Callable, *args, **kwargs):
+    """
+    - 계산이나 직렬화를 하는 동기 함수를 계산 전용 스레드 풀에서 실행합니다.
+    - zarr_io와 같은 방식으로 사용하세요.
+        `dataset = await compute_io(dataset.compute)`
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(compute_executor, partial(func, *args, **kwargs))
 
 
 def xr_open_zarr(path: Path):
@@ -41,11 +113,100 @@ def xr_open_zarr(path: Path):
     return _pooling(proxy)
 
 
+def _replace_dir(src: Path, dst: Path, old: Path):
+    """
+    - dst 디렉토리를 src 디렉토리로 교체합니다.
+    - 디렉토리는 rename으로 덮어쓸 수 없으므로 기존 dst를 old로 옮긴 뒤 src를 옮기고 old를 제거합니다.
+        - 두 rename 사이에는 dst가 없습니다. 읽는 쪽은 store_path로 교체가 끝나길 기다립니다.
+    - _pooling으로 재시도되므로 같은 old 경로로 다시 호출되어도 같은 결과가 되어야 합니다.
+        - 이전 시도에서 dst를 old로 옮겼다면 다시 옮기지 않습니다.
+    """
+    if dst.exists() and not old.exists():
+        dst.rename(old)
+    src.rename(dst)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def _old_dirs(path: Path) -> list:
+    """_replace_dir이 교체 중인 path의 이전 저장소 경로들"""
+    return list(path.parent.glob(f".{path.name}.*.old"))
+
+
+def store_path(path: Path) -> Path | None:
+    """
+    - zarr 저장소 경로를 확인합니다. 저장소가 없으면 None을 반환합니다.
+    - 저장소를 열기 전에 exists 대신 사용하세요.
+        저장소를 교체하는 중(_replace_dir의 두 rename 사이)에는 path가 잠깐 없기 때문입니다.
+        - 이전 저장소(.old)가 있으면 교체 중이므로 path가 나타날 때까지 기다립니다.
+        - EFS_TIMEOUT초가 지나도 나타나지 않으면(교체가 중단됨) 이전 저장소 경로를 반환합니다.
+    """
+    if path.exists():
+        return path
+    start = time.time()
+    retries = 0
+    while olds := _old_dirs(path):
+        if path.exists():
+            return path
+        if time.time() - start > EFS_TIMEOUT:
+            return olds[0]
+        delay = min(BACKOFF_CAP, BACKOFF_BASE * 2**retries)
+        retries += 1
+        time.sleep(random.uniform(0, delay))
+    return path if path.exists() else None
+
+
+def _t_chunks(dataset: xr.Dataset) -> dict:
+    """t축 변수들을 T_CHUNK 크기 청크로 나눠 저장하는 to_zarr encoding"""
+    return {
+        name: {"chunks": (max(1, min(T_CHUNK, var.sizes["t"])),)}
+        for name, var in dataset.data_vars.items()
+        if var.dims == ("t",)
+    }
+
+
 def xr_to_zarr(dataset: xr.Dataset, path: Path):
     """
     - xarray의 to_zarr에 대한 wrapper
     - EFS 사용에 따른 동시성 취약 문제를 핸들링해줍니다.
+    - 같은 폴더의 임시 경로에 모두 쓴 뒤 path와 교체하므로 쓰는 도중의 저장소는 읽히지 않습니다.
+    - t축 변수는 T_CHUNK 단위로 나눠 저장하므로 범위 읽기 시 필요한 청크만 읽습니다.
     - 현재까지 발견된 문제들
         - 동시접속으로 인한 PermissionError, 그리고 이후 전파되는 FileNotFoundError등
     """
-    return _pooling(partial(dataset.to_zarr, path, mode="w"))
+    suffix = uuid.uuid4().hex[:8]
+    temp = path.with_name(f".{path.name}.{suffix}.tmp")
+    old = path.with_name(f".{path.name}.{suffix}.old")
+    try:
+        encoding = _t_chunks(dataset)
+        _pooling(partial(dataset.to_zarr, temp, mode="w", encoding=encoding))
+        _pooling(partial(_replace_dir, temp, path, old))
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+        if old.exists() and not path.exists():  # 교체에 실패하면 이전 저장소를 되돌립니다.
+            old.rename(path)
+
+
+def xr_update_zarr(dataset: xr.Dataset, path: Path, start: int = None):
+    """
+    - zarr 저장소를 t축의 start 위치부터 dataset으로 교체합니다. (증분 갱신용)
+        - 저장소와 겹치는 구간은 덮어쓰고(region) 나머지는 t축으로 이어붙입니다(append).
+        - start가 None이면 데이터는 그대로 두고 attrs만 갱신합니다.
+    - 저장소의 attrs를 dataset의 attrs로 교체합니다.
+    - 재시도 되더라도 같은 결과가 되도록 매번 저장소의 현재 길이를 확인합니다.
+    """
+
+    def proxy():
+        if start is not None:
+            size = zarr.open_group(str(path), mode="r")["t"].shape[0]
+            end = start + dataset.sizes["t"]
+            assert start <= size <= end  # 저장소 중간의 일부만 교체할 수는 없음
+            if size > start:
+                overlap = dataset.isel(t=slice(0, size - start))
+                overlap.to_zarr(path, region={"t": slice(start, size)})
+            if size < end:
+                dataset.isel(t=slice(size - start, None)).to_zarr(path, append_dim="t")
+        group = zarr.open_group(str(path), mode="r+")
+        group.attrs.put(dataset.attrs)
+        zarr.consolidate_metadata(str(path))
+
+    return _pooling(proxy)
@@ -11,7 +11,7 @@ class Factor:
     - Factor는 데이터를 가져오는 get함수를 가지며 Multilingual로 name과 note를 가진다.
     """
 
-    def __init__(self, get: Callable[[], xr.Dataset], name: str, note: str):
+    def __init__(self, get: Callable[..., xr.Dataset], name: str, note: str):
         """name과 note는 영어여야 합니다."""
         self.get = get
         self.name = Multilingual(name)
@@ -7,13 +7,18 @@ import base64
 import asyncio
 from uuid import uuid4
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from typing import Awaitable, Callable, TypeVar, Literal
-from functools import partial
+from functools import partial, wraps
+from importlib.util import find_spec
 
 import jwt
+import orjson
 import httpx
+import numpy as np
 from aiocache import cached
-from fastapi import routing, HTTPException, Request, Depends
+from fastapi import routing, HTTPException, Request, Response, Depends
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from backend import db
@@ -213,6 +218,26 @@ class ServiceTokenBearer(CognitoTokenBearer):
         return db_user
 
 
+class NumpyJSONResponse(ORJSONResponse):
+    """
+    - orjson으로 직렬화하는 JSON 응답입니다.
+    - NumPy 배열과 스칼라, datetime을 리스트나 문자열로 바꾸지 않고 바로 직렬화합니다.
+        - NaN, inf는 null이 됩니다.
+        - orjson이 직접 지원하지 않는 배열(문자열 배열 등)만 tolist로 바꿉니다.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+    @staticmethod
+    def default(obj):
+        if isinstance(obj, (np.ndarray, np.generic)):
+            return obj.tolist()
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=self.default, option=self.option)
+
+
 class APIRouter:
     """
     - 권한 계층별로 라우터 객체를 제공함
@@ -252,26 +277,182 @@ class APIRouter:
         self.professional.user = self.allow_professional_user
 
         # fastapi.APIRouter의 메서드가 path 인자를 입력받지 않은 경우 기본값 "" 를 사용하도록 변경
+        # 모든 메서드에 fast 인자를 추가 (method_wrapping 참고)
         methods = ["get", "post", "put", "patch", "delete", "options", "head", "trace"]
-        for method in methods:
-            target = getattr(self.public, method)
-            setattr(self.public, method, self.method_wrapping(target))
-
-            target = getattr(self.private, method)
-            setattr(self.private, method, self.method_wrapping(target))
+        for router in (self.public, self.private, self.basic, self.professional):
+            for method in methods:
+                target = getattr(router, method)
+                setattr(router, method, self.method_wrapping(target))
 
     @staticmethod
     def method_wrapping(func):
-        def wrapper(path="", *args, **kwargs):
-            return func(path, *args, **kwargs)
+        """
+        - fast=True로 등록한 API 함수는 빠른 응답 경로를 사용합니다.
+            - 반환값을 응답 모델로 다시 검증하고 jsonable_encoder로 변환하는 과정을 건너뛰고
+                NumpyJSONResponse로 바로 직렬화합니다.
+            - 응답 모델(반환 타입 힌트)은 문서에만 사용됩니다. 반환값이 응답 모델과 맞는지는 API 함수가 보장해야 합니다.
+            - NumPy 배열을 tolist 없이 그대로 반환할 수 있으므로 큰 시계열 응답에 사용합니다.
+            - API 함수가 Response 객체를 반환하면 그대로 응답합니다.
+        ```python
+        @router.basic.get("/features", fast=True)
+        async def func(...) -> TimeSeriesGroup:
+            return {"t": [...], "v": np.ndarray}
+        ```
+        """
+
+        def wrapper(path="", *args, fast: bool = False, **kwargs):
+            if not fast:
+                return func(path, *args, **kwargs)
+            kwargs.setdefault("response_class", NumpyJSONResponse)
+            register = func(path, *args, **kwargs)
+
+            def decorator(endpoint):
+                @wraps(endpoint)  # FastAPI는 __wrapped__를 따라가서 매개변수와 응답 모델을 읽음
+                async def fast_endpoint(*args, **kwargs):
+                    content = await endpoint(*args, **kwargs)
+                    if isinstance(content, Response):
+                        return content
+                    return NumpyJSONResponse(content)
+
+                register(fast_endpoint)
+                return endpoint
+
+            return decorator
 
         return wrapper
 
 
+class RateLimiter:
+    """
+    - 토큰 버킷 기반의 적응형 요청 속도 제한기이며 동시 요청 수도 제한합니다.
+    - 429 응답을 받으면 속도를 절반으로 줄이고 Retry-After 동안 모든 요청을 멈춥니다.
+    - 이후 성공 응답을 받을 때마다 max_rate까지 조금씩 속도를 회복합니다.
+    - 하나의 인스턴스를 모든 호출자가 공유해야 의미가 있습니다.
+
+    ```python
+    async with limiter:
+        resp = await client.get(...)
+    limiter.feedback(resp)
+    ```
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        max_inflight: int,
+        min_rate: float = 1,
+        recovery: float = 0.1,
+    ):
+        """
+        - max_rate: 초당 최대 요청 수 (버킷 크기이기도 합니다)
+        - max_inflight: 동시에 진행될 수 있는 최대 요청 수
+        - min_rate: 429 응답이 반복되어도 유지되는 최소 초당 요청 수
+        - recovery: 성공 응답 1회당 회복되는 초당 요청 수
+        """
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.rate = max_rate
+        self.tokens = max_rate
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()  # 토큰을 요청 순서대로 발급하기 위한 락
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self.metrics = {
+            "throttled": 0,  # 수신한 429 응답 수
+            "waited": 0.0,  # 토큰을 기다린 시간의 총합(초)
+        }
+
+    async def __aenter__(self):
+        await self._inflight.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._inflight.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._inflight.release()
+
+    async def _take_token(self):
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.max_rate, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if now < self.paused_until:  # Retry-After 동안 대기
+                    delay = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                else:  # 토큰 1개가 채워질 때까지 대기
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+        self.metrics["waited"] += time.monotonic() - start
+
+    def feedback(self, resp: httpx.Response):
+        """응답 상태에 따라 요청 속도를 조절합니다."""
+        if resp.status_code != 429:
+            self.rate = min(self.max_rate, self.rate + self.recovery)
+            return
+        self.metrics["throttled"] += 1
+        now = time.monotonic()
+        if now < self.paused_until:
+            return  # 이미 감속한 상태에서 뒤늦게 도착한 429 응답은 무시
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0
+        retry_after = self._parse_retry_after(resp.headers.get("Retry-After"))
+        self.paused_until = now + (retry_after or 1)
+        log.info(
+            f"[RateLimiter] 429 응답 수신, 초당 요청 수를 {self.rate:.1f}로 줄이고 "
+            f"{retry_after or 1:.1f}초 동안 요청을 멈춥니다."
+        )
+
+    @staticmethod
+    def _parse_retry_after(value: str | None) -> float | None:
+        """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다."""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0)
+
+
 class FmpAPI:
     """financialmodelingprep API GET Request"""
 
     timeout = 600
+    host = "https://financialmodelingprep.com"
+
+    # ========= 커넥션 풀 설정 =========
+    # 모든 FmpAPI 요청은 프로세스 전역 클라이언트 하나를 공유합니다.
+    # 클라이언트가 FMP 호스트 하나만 상대하므로 max_connections가 곧 호스트당 연결 제한입니다.
+    http2 = True  # h2 패키지가 없으면 HTTP/1.1로 동작합니다.
+    max_connections = 100
+    max_keepalive_connections = 50
+    keepalive_expiry = 60  # 유휴 연결 유지 시간(초)
+    _client: httpx.AsyncClient | None = None
+
+    # ========= 요청 속도 제한 =========
+    # 모든 FmpAPI 호출자가 공유합니다. FMP 요금제의 호출 제한(분당 3000회)에 맞춘 값입니다.
+    limiter = RateLimiter(max_rate=50, max_inflight=100)
+
+    # ========= 요청 병합(singleflight) =========
+    _inflight: dict[tuple, asyncio.Future] = {}  # 진행중인 요청들
+    metrics = {
+        "requested": 0,  # 실제로 수행된 요청 수
+        "merged": 0,  # 진행중인 동일 요청에 병합된 요청 수
+    }
 
     def __init__(self, cache: bool):
         """
@@ -281,6 +462,24 @@ class FmpAPI:
         self.cache = cache
 
     async def get(self, path, **params) -> dict | list:
+        """
+        - 동일한 요청(path, params)이 이미 진행중이면 새로 요청하지 않고 그 결과를 함께 기다립니다. (singleflight)
+            - 반환값은 기다리던 모든 호출자가 공유하므로 수정하지 마세요.
+            - 병합 현황은 FmpAPI.metrics에서 확인할 수 있습니다.
+        """
+        key = (self.cache, path, tuple(sorted(params.items())))
+        if (inflight := self._inflight.get(key)) is not None:
+            self.metrics["merged"] += 1
+            return await asyncio.shield(inflight)
+
+        self.metrics["requested"] += 1
+        inflight = asyncio.ensure_future(self._get(path, **params))
+        self._inflight[key] = inflight
+        inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 호출자 하나가 취소되어도 같은 결과를 기다리는 다른 호출자에게 영향이 없도록 shield
+        return await asyncio.shield(inflight)
+
+    async def _get(self, path, **params) -> dict | list:
         request = self._request_use_caching if self.cache else self._request
         try:
             return await pooling(
@@ -291,16 +490,45 @@ class FmpAPI:
                 f"FMP API 서버와 통신에 실패하여 데이터를 수신하지 못했습니다. (path: {path}, error: {e})"
             )
 
+    @classmethod
+    def client(cls) -> httpx.AsyncClient:
+        """
+        - 프로세스 전역 httpx 클라이언트를 반환합니다.
+        - 클라이언트가 없거나 닫혀있으면 새로 생성합니다.
+        - 연결(TLS 핸드셰이크 포함)을 요청마다 새로 맺지 않고 keep-alive로 재사용합니다.
+        """
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                base_url=cls.host,
+                params={"apikey": SECRETS["FMP_API_KEY"]},
+                timeout=cls.timeout,
+                http2=cls.http2 and find_spec("h2") is not None,
+                limits=httpx.Limits(
+                    max_connections=cls.max_connections,
+                    max_keepalive_connections=cls.max_keepalive_connections,
+                    keepalive_expiry=cls.keepalive_expiry,
+                ),
+            )
+        return cls._client
+
+    @classmethod
+    async def close(cls):
+        """
+        - 프로세스 전역 클라이언트를 닫습니다.
+        - app.py의 lifespan에서 서버 종료 시 호출됩니다.
+        """
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
     @classmethod
     async def _request(cls, path, **params):
-        async with httpx.AsyncClient(
-            base_url="https://financialmodelingprep.com",
-            params={"apikey": SECRETS["FMP_API_KEY"]},
-            timeout=cls.timeout,
-        ) as fmp_client:
-            resp = await fmp_client.get(path, params=params)
-            resp.raise_for_status()
-        return resp.json() if resp.content else {}
+        async with cls.limiter:
+            resp = await cls.client().get(path, params=params)
+        cls.limiter.feedback(resp)
+        resp.raise_for_status()
+        # 시계열 응답은 수 MB에 달하므로 표준 json보다 몇배 빠른 orjson으로 디코딩합니다.
+        return orjson.loads(resp.content) if resp.content else {}
 
     @classmethod
     @cached(cache=ElasticRedisCache, ttl=CacheTTL.MIN)
@@ -3,20 +3,27 @@
 """
 
 import io
+import csv
+import json
+import hashlib
+import math
+import struct
 import asyncio
-from typing import List, Dict
+from datetime import date
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Literal, Iterator, AsyncIterator
 
 import numpy as np
 import xarray as xr
-import pandas as pd
-from openpyxl.utils import get_column_letter
+import xlsxwriter
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from backend.data import fmp
+from backend.data.io import compute_io
 from backend.data.model import Factor
 from backend.data.exceptions import ElementDoesNotExist, LanguageNotSupported
-from backend.calc import deinterpolate, scaling
+from backend.calc import scaling, get_ratio, downsample_indices
 
 
 async def lang_exception_handler(request: Request, call_next):
@@ -30,6 +37,39 @@ async def lang_exception_handler(request: Request, call_next):
         return JSONResponse(status_code=422, content=e.message)
 
 
+def thin(data: xr.Dataset | xr.DataArray, max_points: int | None):
+    """
+    - 데이터가 max_points개를 넘지 않도록 t축을 일정한 간격으로 솎아냅니다.
+    - 마지막 시점은 항상 포함됩니다.
+    - 읽기 전(lazy) 데이터라면 솎아낸 시점들만 메모리로 불러오게 됩니다.
+    """
+    if not max_points or (size := data.sizes["t"]) <= max_points:
+        return data
+    step = math.ceil(size / max_points)
+    return data.isel(t=np.arange(size - 1, -1, -step)[::-1])
+
+
+def downsample(
+    *data: xr.Dataset | xr.DataArray,
+    points: int | None,
+    method: Literal["lttb", "minmax"] = "lttb",
+) -> list:
+    """
+    - t축을 공유하는 데이터들을 차트 표시용으로 points개 정도의 시점으로 줄입니다.
+    - 첫번째 데이터의 모든 변수를 기준으로 시점을 고르고 모든 데이터에 같은 시점을 적용합니다.
+        따라서 줄인 뒤에도 t축을 공유합니다.
+    - points가 None이면 그대로 반환합니다.
+    - method: calc.downsample_indices 참고
+    """
+    if not points or not data or data[0].sizes["t"] <= points:
+        return list(data)
+    base = data[0]
+    values = base.values if isinstance(base, xr.DataArray) else base.to_array().values.T
+    x = base.t.values.astype("datetime64[ns]").astype(float)
+    index = downsample_indices(values, points, method, x=x)
+    return [each.isel(t=index) for each in data]
+
+
 async def get_element(section: str, code: str):
     """Element를 가져옵니다. 존재하지 않는 경우 적절한 HTTPException을 발생시킵니다."""
     try:
@@ -72,6 +112,165 @@ async def get_name(
     }
 
 
+# ========= 시계열 응답 인코딩 =========
+# Accept 헤더에 COLUMNAR_MEDIA_TYPE이 있으면 JSON 대신 바이너리 컬럼 형식으로 응답합니다.
+# - 본문: MAGIC(4) + 헤더 길이(uint32 LE) + 헤더(JSON) + 버퍼들
+#     - 헤더는 JSON 응답과 같은 구조이며 배열 자리에 {"offset", "length", "dtype"}가 들어갑니다.
+#     - 버퍼는 본문 시작 기준 8바이트 정렬된 offset에 있으므로 클라이언트는 복사 없이
+#         Float64Array(body, offset, length), Int32Array(...)로 읽을 수 있습니다.
+#     - 값: float64 little-endian(<f8), 시간: 1970-01-01 기준 일수 int32 little-endian(<i4)
+# - 본문 전체를 하나의 bytes로 합치지 않고 버퍼별로 스트리밍합니다.
+#     - ASGI 본문은 bytes여야 하므로 버퍼는 보낼 때 하나씩 복사되며
+#         추가 메모리는 본문 전체가 아닌 버퍼 하나 크기입니다.
+COLUMNAR_MEDIA_TYPE = "application/vnd.econox.columnar"
+COLUMNAR_MAGIC = b"ECX1"
+
+
+def _columnar(content, buffers: list, offset: list):
+    """content의 NumPy 배열들을 버퍼 참조로 바꾸고 버퍼를 buffers에 모읍니다."""
+    if isinstance(content, dict):
+        return {key: _columnar(value, buffers, offset) for key, value in content.items()}
+    if isinstance(content, list):
+        return [_columnar(value, buffers, offset) for value in content]
+    if not isinstance(content, np.ndarray):
+        return content
+    if np.issubdtype(content.dtype, np.datetime64):
+        array = content.astype("datetime64[D]").astype("<i4")
+    else:
+        array = content.astype("<f8", copy=False)  # little-endian 서버에서는 복사 없음
+    ref = {"offset": offset[0], "length": len(array), "dtype": array.dtype.str}
+    padding = -array.nbytes % 8
+    buffers.append(memoryview(np.ascontiguousarray(array)).cast("B"))
+    buffers.append(b"\0" * padding)
+    offset[0] += array.nbytes + padding
+    return ref
+
+
+def _jsonable(content):
+    """
+    - content의 시간 배열들을 날짜 문자열 리스트로 바꿉니다.
+    - 값 배열은 NumPy 배열 그대로 두며 NumpyJSONResponse가 직렬화합니다.
+    """
+    if isinstance(content, dict):
+        return {key: _jsonable(value) for key, value in content.items()}
+    if isinstance(content, list):
+        return [_jsonable(value) for value in content]
+    if isinstance(content, np.ndarray) and np.issubdtype(content.dtype, np.datetime64):
+        return np.datetime_as_string(content, unit="D").tolist()
+    return content
+
+
+async def _columnar_chunks(prefix: bytes, buffers: list) -> AsyncIterator[bytes]:
+    """헤더와 버퍼들을 차례로 내보냅니다. (버퍼는 보낼 때 bytes로 복사)"""
+    yield prefix
+    for buffer in buffers:
+        if len(buffer):
+            yield bytes(buffer)
+
+
+def time_series_response(request: Request, content: dict) -> dict | Response:
+    """
+    - NumPy 배열을 담은 시계열 응답 content를 요청의 Accept 헤더에 맞게 인코딩합니다.
+        - 기본: JSON 응답용 dict (값은 NumPy 배열, 시간은 날짜 문자열)
+            - 값이 NumPy 배열이므로 fast=True로 등록한 API 함수에서만 사용해야 합니다.
+        - Accept에 COLUMNAR_MEDIA_TYPE이 있으면 바이너리 컬럼 형식 StreamingResponse
+    """
+    if COLUMNAR_MEDIA_TYPE not in request.headers.get("accept", ""):
+        return _jsonable(content)
+    # 버퍼 offset이 헤더 길이에 따라 달라지므로 헤더가 버퍼 시작 위치 앞에 들어갈 때까지 반복합니다.
+    start = 0
+    while True:
+        buffers, offset = [], [start]
+        header = json.dumps(_columnar(content, buffers, offset)).encode()
+        if (end := len(COLUMNAR_MAGIC) + 4 + len(header)) <= start:
+            break
+        start = end + (-end % 8)
+    header += b" " * (start - len(COLUMNAR_MAGIC) - 4 - len(header))
+    prefix = COLUMNAR_MAGIC + struct.pack("<I", len(header)) + header
+    length = len(prefix) + sum(len(buffer) for buffer in buffers)
+    return StreamingResponse(
+        _columnar_chunks(prefix, buffers),
+        media_type=COLUMNAR_MEDIA_TYPE,
+        headers={"Content-Length": str(length)},
+    )
+
+
+CSV_CHUNK_ROWS = 4096  # CSV 스트리밍 응답에서 한번에 보내는 행 수
+
+
+def csv_chunks(
+    columns: List[str], t: np.ndarray, values: List[np.ndarray]
+) -> Iterator[bytes]:
+    """
+    - 시간축과 값 배열들을 CSV_CHUNK_ROWS 행씩 CSV로 인코딩해서 내보냅니다.
+        - DataFrame이나 전체 파일 버퍼를 만들지 않으므로 메모리 사용량이 일정합니다.
+        - StreamingResponse가 스레드풀에서 순회하므로 이벤트 루프를 막지 않습니다.
+    - 형식은 기존 DataFrame.to_csv 결과와 같습니다.
+        - 첫 행: index, time, *columns
+        - index: 0부터 시작하는 행 번호, time: 날짜 문자열, 값: repr 형식이며 NaN은 빈 칸
+    """
+    writer = csv.writer(buffer := io.StringIO(), lineterminator="\n")
+    writer.writerow(["index", "time", *columns])
+    for start in range(0, len(t), CSV_CHUNK_ROWS):
+        end = min(start + CSV_CHUNK_ROWS, len(t))
+        cells = []
+        for array in values:
+            chunk = array[start:end].astype(object)
+            chunk[np.isnan(array[start:end])] = None  # csv 모듈은 None을 빈 칸으로 씀
+            cells.append(chunk)
+        dates = np.datetime_as_string(t[start:end], unit="D")
+        writer.writerows(zip(range(start, end), dates, *cells))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if not len(t):
+        yield buffer.getvalue().encode()
+
+
+# Excel(1900 날짜 체계) 일련번호로 1970-01-01에 해당하는 값
+EXCEL_EPOCH = 25569
+
+
+def xlsx_file(
+    columns: List[str],
+    t: np.ndarray,
+    values: List[np.ndarray],
+    widths: Dict[int, float],
+) -> bytes:
+    """
+    - 시간축과 값 배열들을 xlsx 파일로 인코딩합니다.
+        - xlsxwriter의 constant_memory 모드로 행을 순서대로 바로 씁니다.
+            셀 객체를 만들지 않으므로 메모리 사용량이 행 수와 관계없이 일정합니다.
+            (행 데이터는 임시 파일에 쓴 뒤 close할 때 압축합니다.)
+        - 이벤트 루프를 막지 않도록 compute_io로 실행하세요.
+    - 형식은 기존 DataFrame.to_excel 결과와 같습니다.
+        - 시트 이름: econox, 첫 행: index, time, *columns (굵게, 테두리, 가운데 정렬)
+        - time: YYYY-MM-DD 형식의 날짜 셀, NaN은 빈 칸
+    - widths: {0부터 시작하는 열 번호: 열 너비}
+    """
+    workbook = xlsxwriter.Workbook(buffer := io.BytesIO(), {"constant_memory": True})
+    header = workbook.add_format(
+        {"bold": True, "border": 1, "align": "center", "valign": "top"}
+    )
+    date_format = workbook.add_format({"num_format": "YYYY-MM-DD"})
+    sheet = workbook.add_worksheet("econox")
+    for col, width in widths.items():
+        sheet.set_column(col, col, width)
+    sheet.write_row(0, 0, ["index", "time", *columns], header)
+    days = t.astype("datetime64[D]").astype(np.int64) + EXCEL_EPOCH
+    for start in range(0, len(t), CSV_CHUNK_ROWS):
+        end = min(start + CSV_CHUNK_ROWS, len(t))
+        chunks = [array[start:end].tolist() for array in values]
+        for i, day, *cells in zip(range(start, end), days[start:end].tolist(), *chunks):
+            sheet.write_number(i + 1, 0, i, header)
+            sheet.write_number(i + 1, 1, day, date_format)
+            for col, value in enumerate(cells, start=2):
+                if value == value:  # NaN이 아닌 경우
+                    sheet.write_number(i + 1, col, value)
+    workbook.close()
+    return buffer.getvalue()
+
+
 class Feature:
     """
     - featrue 시계열을 읽고 변환하는 기능을 제공하며 예외를 적절한 HTTPException로 전파시킵니다.
@@ -104,12 +303,8 @@ class Feature:
             "factor_code": self.factor_code,
         }
 
-    async def to_dataset(self) -> xr.Dataset:
-        """
-        - 원본 형식인 Dataset 객체를 반환합니다.
-        - 계산은 가급적 이 Dataset 객체를 통해 수행하세요.
-        - 데이터가 존재하지 않는 경우 None 반환
-        """
+    async def get_factor(self) -> Factor:
+        """피쳐의 Factor 객체를 반환합니다."""
         element = await get_element(self.element_section, self.element_code)
         # ClientMeta 메타클래스가 만든 data_class 클래스의 인스턴스
         try:
@@ -124,67 +319,128 @@ class Feature:
             raise HTTPException(
                 status_code=404, detail=f"factor_code {self.factor_code} does not exist"
             )
-        ds = await factor.get()
-        return ds.compute() if ds else None
+        return factor
 
-    async def to_data_array(self, interpolate: bool = False) -> xr.DataArray | None:
-        """데이터가 존재하지 않는 경우 None 반환"""
-        if dataset := await self.to_dataset():
-            return dataset.daily if interpolate else deinterpolate(dataset)
+    async def to_dataset(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        max_points: int | None = None,
+        compute: bool = True,
+    ) -> xr.Dataset:
+        """
+        - 원본 형식인 Dataset 객체를 반환합니다.
+        - 계산은 가급적 이 Dataset 객체를 통해 수행하세요.
+        - start, end: 가져올 기간 (양 끝 포함), 기간과 겹치는 부분만 저장소에서 읽습니다.
+        - max_points: 최대 시점 갯수, 넘으면 일정한 간격으로 솎아냅니다.
+        - compute: False인 경우 저장소에서 읽기 전(lazy) Dataset을 반환합니다.
+        - 데이터가 존재하지 않는 경우 None 반환
+        """
+        factor = await self.get_factor()
+        if not (ds := await factor.get(start=start, end=end)):
+            return None
+        ds = thin(ds, max_points)
+        return await compute_io(ds.compute) if compute else ds
 
-    async def to_dataframe(self, interpolate: bool = False) -> pd.DataFrame | None:
+    async def to_data_array(
+        self,
+        interpolate: bool = False,
+        start: date | None = None,
+        end: date | None = None,
+        max_points: int | None = None,
+    ) -> xr.DataArray | None:
         """
-        - 인덱스와 time, value 컬럼을 가진 dataframe을 반환합니다.
         - interpolate: Default[False]
             - True인 경우 모든 일(daily)가 채워진 데이터를 반환합니다.
-            - False인 경우 실제 원본 데이터를 반환합니다.
-        - 데이터가 존재하지 않는 경우 AssertionError
+            - False인 경우 실제 원본 데이터를 반환합니다. 보간하지 않고 읽습니다.
+        - start, end, max_points: to_dataset 참고
+        - 데이터가 존재하지 않는 경우 None 반환
         """
-        assert (data_array := await self.to_data_array(interpolate)) is not None
-        data_frame = data_array.to_dataframe().reset_index()
-        data_frame.t = data_frame.t.dt.date
-        data_frame.columns = ["time", "value"]
-        data_frame.index.name = "index"
-        return data_frame
-
-    async def to_csv(self, interpolate: bool = False) -> bytes:
+        if interpolate:
+            if dataset := await self.to_dataset(start, end, max_points):
+                return dataset.daily
+            return None
+        factor = await self.get_factor()
+        data_array = await factor.get(interpolate=False, start=start, end=end)
+        return thin(data_array, max_points) if data_array is not None else None
+
+    async def to_csv(self, interpolate: bool = False) -> Iterator[bytes]:
         """
         - interpolate: Default[False]
             - True인 경우 모든 일(daily)가 채워진 데이터를 반환합니다.
             - False인 경우 실제 원본 데이터를 반환합니다.
-        - return: 파일 데이터를 bytes로 반환합니다. 디스크를 사용하지 않습니다.
+        - return: 파일 데이터를 조각(bytes)으로 내보내는 이터레이터를 반환합니다.
+            - StreamingResponse의 content로 사용하세요. (csv_chunks 참고)
             - 데이터가 존재하지 않는 경우 AssertionError
         """
-        data_frame = await self.to_dataframe(interpolate)
-        data_frame.to_csv(buffer := io.BytesIO())
-        return buffer.getvalue()
+        assert (data_array := await self.to_data_array(interpolate)) is not None
+        return csv_chunks(["value"], data_array.t.values, [data_array.values])
 
     async def to_xlsx(self, interpolate: bool = False) -> bytes:
         """
         - interpolate: Default[False]
             - True인 경우 모든 일(daily)가 채워진 데이터를 반환합니다.
             - False인 경우 실제 원본 데이터를 반환합니다.
-        - return: 파일 데이터를 bytes로 반환합니다. 디스크를 사용하지 않습니다.
+        - return: 파일 데이터를 bytes로 반환합니다. (xlsx_file 참고)
             - 데이터가 존재하지 않는 경우 AssertionError
         """
-        data_frame = await self.to_dataframe(interpolate)
-        sheet_name = f"econox"
-        with pd.ExcelWriter(
-            buffer := io.BytesIO(), date_format="YYYY-MM-DD", engine="openpyxl"
-        ) as writer:
-            data_frame.to_excel(writer, sheet_name=sheet_name)
-            sheet = writer.sheets[sheet_name]
-            # 컬럼 길이가 글자 길이보다 작으면 깨지므로 여유롭게 설정
-            sheet.column_dimensions[get_column_letter(2)].width = 15
-            sheet.column_dimensions[get_column_letter(3)].width = 23
-        return buffer.getvalue()
+        assert (data_array := await self.to_data_array(interpolate)) is not None
+        # 컬럼 길이가 글자 길이보다 작으면 깨지므로 여유롭게 설정
+        widths = {1: 15, 2: 23}
+        return await compute_io(
+            xlsx_file, ["value"], data_array.t.values, [data_array.values], widths
+        )
+
+
+def _data_version(dataset: xr.Dataset) -> tuple:
+    """저장소 메타데이터로 만든 데이터 버전 (수집 날짜, t축 길이, 마지막 t)"""
+    collected = dataset.attrs.get("client", {}).get("collected")
+    last_t = dataset.t.values[-1] if dataset.sizes["t"] else None
+    return collected, dataset.sizes["t"], last_t
+
+
+class DerivedCache:
+    """
+    - FeatureGroup이 읽은 피쳐 데이터와 파생 데이터(original, scaled, ratio)를 보관하는 프로세스 내 LRU 캐시
+    - 키: (피쳐 구성, 공통 구간, max_points, 피쳐별 데이터 버전)
+        - 피쳐의 저장소가 갱신되거나 그룹의 피쳐 구성이 바뀌면 키가 바뀌므로 이전 항목은
+            더 이상 조회되지 않고 LRU에서 밀려납니다.
+    - 항목들의 크기 합이 max_bytes를 넘으면 오래된 항목부터 제거합니다.
+    - 캐시된 Dataset은 여러 요청이 공유하므로 수정하면 안 됩니다.
+    """
+
+    max_bytes = 256 * 1024**2
+    _lru: OrderedDict = OrderedDict()  # key -> (entry, nbytes)
+    _size = 0
+
+    @staticmethod
+    def _nbytes(entry: dict) -> int:
+        datasets = [*entry["members"], *entry.get("derived", ())]
+        return sum(ds.nbytes for ds in datasets)
+
+    @classmethod
+    def get(cls, key: tuple) -> dict | None:
+        if (item := cls._lru.get(key)) is None:
+            return None
+        cls._lru.move_to_end(key)
+        return item[0]
+
+    @classmethod
+    def put(cls, key: tuple, entry: dict):
+        if (item := cls._lru.pop(key, None)) is not None:
+            cls._size -= item[1]
+        cls._lru[key] = (entry, nbytes := cls._nbytes(entry))
+        cls._size += nbytes
+        while cls._size > cls.max_bytes and len(cls._lru) > 1:
+            _, (_, nbytes) = cls._lru.popitem(last=False)
+            cls._size -= nbytes
 
 
 class FeatureGroup:
     """
     - 피쳐들을 묶어서 그룹으로 사용 가능한 데이터를 제공합니다.
     - 시계열 데이터는 정규화되며 모든 데이터의 길이가 동일하도록 자릅니다.
-    - Pandas dataframe 객체나 xlsx, csv 파일로 뽑아낼 수 있습니다.
+    - xlsx, csv 파일로 뽑아낼 수 있습니다.
 
     ```python
     group = await FeatureGroup(feature1, feature2, feature3).init()
@@ -193,14 +449,25 @@ class FeatureGroup:
     ```
     """
 
-    def __init__(self, *features: Feature):
+    def __init__(
+        self,
+        *features: Feature,
+        start: date | None = None,
+        end: date | None = None,
+        max_points: int | None = None,
+    ):
         """
         - features: 그룹으로 정의할 Feature 객체들
+        - start, end: 가져올 기간 (양 끝 포함), 기간과 겹치는 부분만 저장소에서 읽습니다.
+        - max_points: 최대 시점 갯수, 넘으면 모든 피쳐를 같은 간격으로 솎아냅니다.
         - 인스턴스 생성 방법:
             - `group = await FeatureGroup(...).init()`
+            - `group = await FeatureGroup(...).init(load=False)` (데이터는 group.load()로 읽음)
         """
         self.src = features
+        self.start, self.end, self.max_points = start, end, max_points
         self._init = False  # init 여부
+        self._key = None  # 그룹 내용 키, init에서 만들어집니다.
 
     def __getitem__(self, fe: Feature) -> xr.Dataset:
         assert self._init
@@ -212,23 +479,63 @@ class FeatureGroup:
     def __delitem__(self, *args):
         raise PermissionError("이 객체는 읽기 전용입니다.")
 
-    async def init(self):
-        ds_arr = await asyncio.gather(*[fe.to_dataset() for fe in self.src])
+    async def init(self, load: bool = True):
+        """
+        - load: False면 저장소에서 데이터를 읽지 않고 공통 구간과 content_hash만 준비합니다.
+            - 분석 결과 캐시(AnalysisCache)를 먼저 확인할 때 사용하며 데이터가 필요해지면 load를 호출합니다.
+        """
+        # 저장소에서 읽기 전(lazy) Dataset들의 t축으로 공통 구간을 먼저 구한 뒤
+        # 공통 구간만 저장소에서 읽습니다.
+        ds_arr = await asyncio.gather(
+            *[fe.to_dataset(self.start, self.end, compute=False) for fe in self.src]
+        )
         if not ds_arr:
             raise HTTPException(
                 status_code=404, detail="Empty feature groups cannot be processed"
             )
-        min_t = np.max([ds.t[0].to_numpy() for ds in ds_arr])
-        max_t = np.min([ds.t[-1].to_numpy() for ds in ds_arr])
+        if all(ds.sizes["t"] for ds in ds_arr):
+            min_t = np.max([ds.t[0].to_numpy() for ds in ds_arr])
+            max_t = np.min([ds.t[-1].to_numpy() for ds in ds_arr])
+            sliced = [ds.sel(t=slice(min_t, max_t)) for ds in ds_arr]
+            self.window = (min_t, max_t)
+        else:  # 기간 안에 데이터가 없는 피쳐가 있으면 공통 구간도 없음
+            sliced = [ds.isel(t=slice(0, 0)) for ds in ds_arr]
+            self.window = None
+        # 공통 구간의 일별 t축은 모두 같으므로 같은 간격으로 솎아내면 t축이 유지됩니다.
+        self._sliced = [thin(ds, self.max_points) for ds in sliced]
+        # 피쳐 구성, 공통 구간, 데이터 버전이 같으면 같은 데이터입니다. (DerivedCache 참고)
+        members = tuple(fe.repr_str() for fe in self.src)
+        versions = tuple(map(_data_version, ds_arr))
+        self._key = (members, self.window, self.max_points, versions)
+        return await self.load() if load else self
+
+    async def load(self):
+        """공통 구간의 데이터를 읽습니다. 피쳐 구성과 데이터 버전이 같으면 저장소를 다시 읽지 않습니다."""
+        assert self._key is not None
+        if self._init:
+            return self
+        if (entry := DerivedCache.get(self._key)) is None:
+            sliced = self._sliced
+            computed = await compute_io(lambda: [ds.compute() for ds in sliced])
+            DerivedCache.put(self._key, entry := {"members": computed})
 
         self._dict = {  # 그룹의 개별 데이터셋 접근자 활성화
-            fe.repr_str(): ds.sel(t=slice(min_t, max_t))
-            for fe, ds in zip(self.src, ds_arr)
+            fe.repr_str(): ds for fe, ds in zip(self.src, entry["members"])
         }
 
         self._init = True
         return self
 
+    def content_hash(self) -> str:
+        """
+        - 피쳐 구성, 공통 구간, max_points, 피쳐별 데이터 버전으로 만든 그룹 내용 해시
+        - DerivedCache 키와 같은 기준이므로 저장소가 갱신되면 해시도 바뀝니다.
+        - init(load=False)만 호출한 상태에서도 사용할 수 있습니다.
+        """
+        assert self._key is not None
+        content = json.dumps(self._key, default=str).encode()
+        return hashlib.sha256(content).hexdigest()
+
     async def get_columns(self, lang: str) -> List[str]:
         """
         - lang: 테이블 컬럼명에 사용할 언어
@@ -266,28 +573,35 @@ class FeatureGroup:
             attrs={fe.repr_str(): self[fe].attrs for fe in self.src},
         ).compute()
 
-    async def to_dataframe(self, lang: str, minmax_scaling: bool = False):
+    def derived(self) -> Tuple[xr.Dataset, xr.Dataset, xr.Dataset]:
         """
-        - minmax_scaling: True인 경우 모든 값을 0에서 1사이로 Min-Max Scaling 합니다.
-        - lang: 컬럼 명으로 사용할 언어
+        - 차트용 파생 데이터 (original, scaled, ratio)를 반환합니다.
+            - original: to_dataset(), scaled: to_dataset(minmax_scaling=True)
+            - ratio: get_ratio(original)
+        - DerivedCache에 보관되므로 같은 버전의 그룹은 다시 계산하지 않습니다.
+            - 반환된 Dataset은 공유되므로 수정하지 마세요.
         """
         assert self._init
-        data_set = self.to_dataset(minmax_scaling)
-        data_frame = data_set.to_dataframe().reset_index()
-        data_frame.t = data_frame.t.dt.date
-        data_frame.columns = ["time"] + await self.get_columns(lang)
-        data_frame.index.name = "index"
-        return data_frame
-
-    async def to_csv(self, lang: str, minmax_scaling: bool = False) -> bytes:
+        entry = DerivedCache.get(self._key) or {
+            "members": [self[fe] for fe in self.src]
+        }
+        if "derived" not in entry:
+            original = self.to_dataset()
+            scaled = self.to_dataset(minmax_scaling=True)
+            entry["derived"] = (original, scaled, get_ratio(original))
+            DerivedCache.put(self._key, entry)
+        return entry["derived"]
+
+    async def to_csv(self, lang: str, minmax_scaling: bool = False) -> Iterator[bytes]:
         """
         - minmax_scaling: True인 경우 모든 값을 0에서 1사이로 Min-Max Scaling 합니다.
         - lang: 컬럼 명으로 사용할 언어
+        - return: 파일 데이터를 조각(bytes)으로 내보내는 이터레이터 (csv_chunks 참고)
         """
         assert self._init
-        data_frame = await self.to_dataframe(lang, minmax_scaling)
-        data_frame.to_csv(buffer := io.BytesIO())
-        return buffer.getvalue()
+        data_set = self.to_dataset(minmax_scaling)
+        values = [data_set[fe.repr_str()].values for fe in self.src]
+        return csv_chunks(await self.get_columns(lang), data_set.t.values, values)
 
     async def to_xlsx(self, lang: str, minmax_scaling: bool = False) -> bytes:
         """
@@ -295,18 +609,14 @@ class FeatureGroup:
         - lang: 컬럼 명으로 사용할 언어
         """
         assert self._init
-        data_frame = await self.to_dataframe(lang, minmax_scaling)
-        sheet_name = f"econox"
-        with pd.ExcelWriter(
-            buffer := io.BytesIO(), date_format="YYYY-MM-DD", engine="openpyxl"
-        ) as writer:
-            data_frame.to_excel(writer, sheet_name=sheet_name)
-            sheet = writer.sheets[sheet_name]
-            # 컬럼 길이를 여유롭게 설정
-
-            for idx, name in enumerate(data_frame.columns):
-                colume_letter = get_column_letter(idx + 2)
-                # 23을 최소값으로 두고 이름 길이에 따라 길이 계산 (1.15는 실험적으로 찾아낸 값)
-                sheet.column_dimensions[colume_letter].width = max(23, len(name) * 1.15)
-            sheet.column_dimensions[get_column_letter(2)].width = 15
-        return buffer.getvalue()
+        data_set = self.to_dataset(minmax_scaling)
+        columns = await self.get_columns(lang)
+        # 컬럼 길이를 여유롭게 설정
+        # 23을 최소값으로 두고 이름 길이에 따라 길이 계산 (1.15는 실험적으로 찾아낸 값)
+        widths = {
+            idx + 1: max(23, len(name) * 1.15)
+            for idx, name in enumerate(["time", *columns])
+        }
+        widths[1] = 15
+        values = [data_set[fe.repr_str()].values for fe in self.src]
+        return await compute_io(xlsx_file, columns, data_set.t.values, values, widths)
@@ -0,0 +1,100 @@
+"""
+- /api/data/features 응답 본문 인코딩 벤치마크
+- 기존 경로(tolist + 응답 모델 검증 + jsonable_encoder + json.dumps)와
+    fast=True 경로(NumpyJSONResponse, NumPy 배열을 orjson으로 바로 직렬화)를 비교합니다.
+- 사용 예시: sh script/run_test.sh script/bench_features_encoding.py [피쳐 수] [시점 수]
+    - 기본값은 피쳐 10개, 시점 30년치(약 11,000개)입니다.
+"""
+import sys
+import time
+import json
+import asyncio
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from backend.http import NumpyJSONResponse
+from backend.integrate import _jsonable
+from backend.api.data import TimeSeriesGroup
+
+REPEAT = 10
+
+
+def synthesize(features: int, points: int) -> dict:
+    """FeatureGroup.to_dataset 결과로 만든 /features 응답 content와 같은 형태"""
+    rng = np.random.default_rng(0)
+    t = np.arange(np.datetime64("1993-01-01"), np.datetime64("1993-01-01") + points)
+    values = []
+    for i in range(features):
+        original = rng.normal(100, 10, points).cumsum()
+        values.append(
+            {
+                "element": {"section": "symbol", "code": f"SYM{i}"},
+                "factor": {"section": "HistoricalPrice", "code": "close"},
+                "original": original,
+                "scaled": (original - original.min()) / np.ptp(original),
+                "ratio": rng.uniform(0, 100, points),
+            }
+        )
+    return {"t": t.astype("datetime64[ns]"), "v": values}
+
+
+def tolist(content):
+    """기존 time_series_response의 JSON 경로: 모든 배열을 리스트로 바꿉니다."""
+    if isinstance(content, dict):
+        return {key: tolist(value) for key, value in content.items()}
+    if isinstance(content, list):
+        return [tolist(value) for value in content]
+    if isinstance(content, np.ndarray):
+        return content.tolist()
+    return content
+
+
+field = create_response_field(name="Response_features", type_=TimeSeriesGroup)
+
+
+async def legacy(content: dict) -> bytes:
+    """기존 경로: FastAPI가 응답 모델로 검증하고 JSONResponse로 직렬화합니다."""
+    content = tolist(_jsonable(content))
+    serialized = await serialize_response(field=field, response_content=content)
+    return JSONResponse(serialized).body
+
+
+async def fast(content: dict) -> bytes:
+    """fast=True 경로"""
+    return NumpyJSONResponse(_jsonable(content)).body
+
+
+async def measure(name: str, encode, content: dict) -> float:
+    elapsed = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        body = await encode(content)
+        elapsed.append(time.perf_counter() - start)
+    best, median = min(elapsed) * 1000, np.median(elapsed) * 1000
+    print(f"[{name}] 최소 {best:.1f}ms, 중앙값 {median:.1f}ms, 본문 {len(body) / 1e6:.1f}MB")
+    return median
+
+
+async def main():
+    features, points = map(int, sys.argv[1:3]) if len(sys.argv) > 2 else (10, 11_000)
+    content = synthesize(features, points)
+    print(f"피쳐 {features}개, 시점 {points}개")
+
+    # 두 경로의 응답 본문이 같은 JSON인지 확인
+    expected = json.loads(await legacy(content))
+    result = json.loads(await fast(content))
+    assert expected["t"] == result["t"]
+    for a, b in zip(expected["v"], result["v"]):
+        for key in ("original", "scaled", "ratio"):
+            assert np.allclose(a[key], b[key], rtol=0, atol=0)
+
+    before = await measure("기존: tolist + 응답 모델 검증 + json", legacy, content)
+    after = await measure("fast: NumpyJSONResponse (orjson)", fast, content)
+    print(f"{before / after:.1f}배 빠름")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+- FmpAPI 커넥션 풀 벤치마크
+- 로컬 스텁 서버를 띄우고 요청마다 클라이언트를 새로 만드는 기존 방식과
+    프로세스 전역 클라이언트를 공유하는 방식의 연결(핸드셰이크) 수와 지연시간(p50/p99)을 비교합니다.
+- 사용 예시: sh script/run_test.sh script/bench_fmp_pool.py
+- 스텁 서버는 TLS를 쓰지 않으므로 새 연결마다 HANDSHAKE_DELAY만큼 지연시켜 TLS 핸드셰이크 비용을 흉내냅니다.
+"""
+import time
+import asyncio
+
+import httpx
+import numpy as np
+
+from backend.http import FmpAPI
+
+HOST, PORT = "127.0.0.1", 8765
+HANDSHAKE_DELAY = 0.03  # 새 연결에 대한 핸드셰이크 비용(초)
+RESPONSE_DELAY = 0.005  # 요청 처리 시간(초)
+REQUESTS = 100  # 50개 symbol 검색 = profile + search 요청 100개
+
+connections = 0
+
+
+async def stub_server(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """keep-alive를 지원하는 최소한의 HTTP/1.1 서버"""
+    global connections
+    connections += 1
+    await asyncio.sleep(HANDSHAKE_DELAY)
+    body = b'[{"symbol": "AAPL"}]'
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            await asyncio.sleep(RESPONSE_DELAY)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def legacy_request(path, **params):
+    """기존 FmpAPI._request: 요청마다 클라이언트를 생성하고 닫습니다."""
+    async with httpx.AsyncClient(
+        base_url=FmpAPI.host, timeout=FmpAPI.timeout
+    ) as client:
+        resp = await client.get(path, params=params)
+        resp.raise_for_status()
+    return resp.json() if resp.content else {}
+
+
+async def measure(name: str, request):
+    global connections
+    connections = 0
+    latencies = []
+
+    async def timed(i):
+        start = time.perf_counter()
+        await request(f"api/v3/profile/SYM{i}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[timed(i) for i in range(REQUESTS)])
+    await asyncio.gather(*[timed(i) for i in range(REQUESTS)])  # 두번째 검색
+    total = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(
+        f"[{name}] 요청 {len(latencies)}개, 연결(핸드셰이크) {connections}회, "
+        f"p50 {p50:.1f}ms, p99 {p99:.1f}ms, 총 {total:.2f}초"
+    )
+
+
+async def main():
+    FmpAPI.host = f"http://{HOST}:{PORT}"
+    server = await asyncio.start_server(stub_server, HOST, PORT)
+    async with server:
+        await measure("요청별 클라이언트 (기존)", legacy_request)
+        await measure("공유 커넥션 풀", FmpAPI._request)
+        await FmpAPI.close()
+        server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
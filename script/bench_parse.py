@@ -0,0 +1,98 @@
+"""
+- FMP 시계열 응답 디코딩 + 파싱 마이크로벤치마크
+- 기존 방식(json 디코딩, 펙터마다 레코드 전체를 순회)과
+    현재 방식(orjson 디코딩, ClientMeta.parse의 단일 순회 구조화 배열)을 비교합니다.
+- 사용 예시: sh script/run_test.sh script/bench_parse.py [기록된 응답 JSON 파일]
+    - 파일을 주지 않으면 api/v3/historical-price-full 응답과 같은 형태로 30년치 일별 데이터를 만듭니다.
+    - 응답 기록 예시: curl "https://financialmodelingprep.com/api/v3/historical-price-full/AAPL?from=1900-01-01&apikey=..." > aapl.json
+"""
+import sys
+import json
+import time
+from datetime import date, timedelta
+
+import orjson
+import numpy as np
+import xarray as xr
+
+from backend.data.fmp.integrate import HistoricalPrice
+from backend.data.fmp.data_metaclass import _xr_meta
+
+REPEAT = 20
+FIELDS = [
+    "open",
+    "high",
+    "low",
+    "close",
+    "adjClose",
+    "volume",
+    "unadjustedVolume",
+    "change",
+    "changePercent",
+    "vwap",
+    "changeOverTime",
+]
+
+
+def synthesize(days: int = 30 * 365) -> bytes:
+    """historical-price-full 응답 형태의 데이터 (일부 값은 누락 또는 null)"""
+    rng = np.random.default_rng(0)
+    historical = []
+    for i in range(days):
+        day = {"date": str(date(2023, 11, 22) - timedelta(days=i))}
+        day |= {field: float(rng.normal(100, 10)) for field in FIELDS}
+        day["label"] = "November 22, 23"
+        if i % 50 == 0:
+            del day["vwap"]
+        if i % 70 == 0:
+            day["open"] = None
+        historical.append(day)
+    return json.dumps({"symbol": "AAPL", "historical": historical}).encode()
+
+
+def legacy(client, raw: bytes):
+    """기존 ClientMeta.parse (JSON 디코딩 포함)"""
+    series = json.loads(raw)["historical"]
+    t = np.array([np.datetime64(day[client.t_key], "ns") for day in series])
+    collected = {}
+    for factor in client.factors:
+        collected[factor] = xr.DataArray(
+            np.array([day.get(factor, np.nan) for day in series], dtype=float),
+            dims="t",
+            coords={"t": t},
+            attrs=_xr_meta(element=client.symbol, factor=factor),
+        )
+    return collected
+
+
+def current(client, raw: bytes):
+    """현재 ClientMeta.parse (JSON 디코딩 포함)"""
+    return client.parse(orjson.loads(raw)["historical"])
+
+
+def measure(name: str, func, client, raw: bytes) -> float:
+    elapsed = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(client, raw)
+        elapsed.append(time.perf_counter() - start)
+    best, median = min(elapsed) * 1000, np.median(elapsed) * 1000
+    print(f"[{name}] 최소 {best:.1f}ms, 중앙값 {median:.1f}ms")
+    return median
+
+
+if __name__ == "__main__":
+    raw = open(sys.argv[1], "rb").read() if len(sys.argv) > 1 else synthesize()
+    client = HistoricalPrice("AAPL")
+    rows = len(orjson.loads(raw)["historical"])
+    print(f"레코드 {rows}개, 펙터 {len(client.factors)}개, 응답 {len(raw) / 1e6:.1f}MB")
+
+    # 두 방식의 결과가 같은지 확인
+    expected, result = legacy(client, raw), current(client, raw)
+    for factor, data_array in expected.items():
+        assert np.array_equal(result[factor].t.values, data_array.t.values)
+        assert np.array_equal(result[factor].values, data_array.values, equal_nan=True)
+
+    before = measure("기존: json + 펙터별 순회", legacy, client, raw)
+    after = measure("현재: orjson + 구조화 배열", current, client, raw)
+    print(f"{before / after:.1f}배 빠름")
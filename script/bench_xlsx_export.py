@@ -0,0 +1,90 @@
+"""
+- 피쳐 그룹 xlsx 내보내기 벤치마크
+- 기존 방식(DataFrame + pd.ExcelWriter(engine="openpyxl"))과
+    현재 방식(backend.integrate.xlsx_file, xlsxwriter constant_memory)의 시간과 최대 메모리를 비교합니다.
+- 사용 예시: sh script/run_test.sh script/bench_xlsx_export.py [피쳐 수] [시점 수]
+    - 기본값은 피쳐 10개, 시점 20,000개입니다.
+- 최대 메모리는 tracemalloc으로 측정한 Python 할당량입니다.
+"""
+import io
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import openpyxl
+from openpyxl.utils import get_column_letter
+
+from backend.integrate import xlsx_file
+
+
+def synthesize(features: int, points: int):
+    rng = np.random.default_rng(0)
+    t = np.arange(np.datetime64("1970-01-01"), np.datetime64("1970-01-01") + points)
+    values = [rng.normal(100, 10, points).cumsum() for _ in range(features)]
+    for array in values:
+        array[rng.integers(0, points, points // 100)] = np.nan
+    columns = [f"[Element {i}] HistoricalPrice(close)" for i in range(features)]
+    return columns, t.astype("datetime64[ns]"), values
+
+
+def widths(columns):
+    """FeatureGroup.to_xlsx의 열 너비"""
+    widths = {
+        idx + 1: max(23, len(name) * 1.15)
+        for idx, name in enumerate(["time", *columns])
+    }
+    widths[1] = 15
+    return widths
+
+
+def legacy(columns, t, values) -> bytes:
+    """기존 FeatureGroup.to_dataframe + to_xlsx"""
+    data_frame = pd.DataFrame({"t": t, **dict(zip(columns, values))})
+    data_frame.t = data_frame.t.dt.date
+    data_frame.columns = ["time"] + columns
+    data_frame.index.name = "index"
+    with pd.ExcelWriter(
+        buffer := io.BytesIO(), date_format="YYYY-MM-DD", engine="openpyxl"
+    ) as writer:
+        data_frame.to_excel(writer, sheet_name="econox")
+        sheet = writer.sheets["econox"]
+        for col, width in widths(columns).items():
+            sheet.column_dimensions[get_column_letter(col + 1)].width = width
+    return buffer.getvalue()
+
+
+def current(columns, t, values) -> bytes:
+    return xlsx_file(columns, t, values, widths(columns))
+
+
+def measure(name: str, func, *args) -> tuple:
+    start = time.perf_counter()
+    content = func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()  # tracemalloc이 느리므로 시간과 메모리는 따로 측정
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"[{name}] {elapsed:.2f}초, 최대 메모리 {peak / 1e6:.1f}MB, "
+        f"파일 {len(content) / 1e6:.1f}MB"
+    )
+    return elapsed, peak, content
+
+
+def cells(content: bytes) -> list:
+    sheet = openpyxl.load_workbook(io.BytesIO(content), read_only=True)["econox"]
+    return [row for row in sheet.iter_rows(values_only=True)]
+
+
+if __name__ == "__main__":
+    features, points = map(int, sys.argv[1:3]) if len(sys.argv) > 2 else (10, 20_000)
+    args = synthesize(features, points)
+    print(f"피쳐 {features}개, 시점 {points}개 (셀 {features * points:,}개)")
+
+    before, before_peak, expected = measure("기존: openpyxl", legacy, *args)
+    after, after_peak, result = measure("현재: xlsxwriter constant_memory", current, *args)
+    assert cells(expected) == cells(result)  # 두 파일의 셀 값이 같은지 확인
+    print(f"{before / after:.1f}배 빠름, 최대 메모리 {before_peak / after_peak:.1f}배 적음")
@@ -0,0 +1,31 @@
+"""
+- 펙터별 zarr 저장소(features/symbol/{symbol}/{class}/{factor}.zarr)를
+    데이터 클래스별 단일 저장소(features/symbol/{symbol}/{class}.zarr)로 옮깁니다.
+- 사용 예시: sh script/run_test.sh script/migrate_zarr_layout.py
+- 옮긴 뒤 backend/data/fmp/data_metaclass.py의 ClientMeta.layout을 "group"으로 설정하세요.
+    - 설정하지 않으면 다음 갱신 때 다시 펙터별 저장소로 저장됩니다.
+- raw 저장 형식 데이터 클래스(data_class.json setting의 storage)는 옮기지 않습니다.
+    - 다음 갱신 때 raw 저장소({class}.raw.zarr)로 다시 저장되며 기존 저장소는 제거됩니다.
+"""
+import time
+
+from backend.data.fmp import integrate
+from backend.data.fmp.data_metaclass import DATA_PATH
+
+start = time.time()
+count = 0
+symbol_dirs = sorted(DATA_PATH.iterdir()) if DATA_PATH.exists() else []
+for symbol_dir in symbol_dirs:
+    for class_dir in sorted(symbol_dir.iterdir()):
+        if not class_dir.is_dir() or class_dir.suffix == ".zarr":
+            continue  # 이미 옮겨진 저장소
+        if (data_class := getattr(integrate, class_dir.name, None)) is None:
+            print(f"[건너뜀] 알 수 없는 데이터 클래스: {class_dir}")
+            continue
+        if data_class.storage == "raw":
+            continue  # 다음 갱신 때 raw 저장소로 다시 저장됨
+        data_class(symbol_dir.name).migrate()
+        count += 1
+        print(f"[완료] {symbol_dir.name}/{class_dir.name}")
+
+print(f"{count}개 저장소를 옮겼습니다. [{time.time() - start:.1f}초]")
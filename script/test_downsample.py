@@ -0,0 +1,79 @@
+"""
+- 다운샘플링(calc.lttb, calc.minmax_buckets) 검사
+- 이동 통계량처럼 NaN이 섞인 시계열에서도 버킷마다 의미 있는 점을 고르는지 확인합니다.
+    - lttb는 NaN을 건너뛰는 단순 구현(reference_lttb)과 결과가 같아야 합니다.
+    - NaN이 나온 뒤의 버킷들이 버킷 첫 점으로만 채워지면 안 됩니다.
+- 사용 예시: sh script/run_test.sh script/test_downsample.py
+"""
+import numpy as np
+
+from backend.calc import lttb, minmax_buckets
+
+
+def reference_lttb(y: np.ndarray, points: int) -> np.ndarray:
+    """점마다 반복하는 LTTB, NaN은 평균과 선택에서 제외"""
+    size = len(y)
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    bounds = list(edges) + [size]
+    selected, anchor = [0], 0
+    for i in range(points - 2):
+        start, stop = bounds[i], bounds[i + 1]
+        following = [j for j in range(stop, bounds[i + 2]) if not np.isnan(y[j])]
+        best, pick = -1.0, None
+        if following and not np.isnan(y[anchor]):
+            avg_x = sum(following) / len(following)
+            avg_y = sum(y[j] for j in following) / len(following)
+            for j in range(start, stop):
+                if np.isnan(y[j]):
+                    continue
+                area = abs(
+                    (anchor - avg_x) * (y[j] - y[anchor])
+                    - (anchor - j) * (avg_y - y[anchor])
+                )
+                if area > best:
+                    best, pick = area, j
+        if pick is None:
+            inside = [j for j in range(start, stop) if not np.isnan(y[j])]
+            pick = inside[0] if inside else start
+        selected.append(pick)
+        if not np.isnan(y[pick]):
+            anchor = pick
+    return np.array(selected + [size - 1])
+
+
+def main():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=5000).cumsum()
+    assert np.array_equal(lttb(y, 200), reference_lttb(y, 200))
+
+    # 앞부분 NaN(구간이 덜 채워진 이동 통계량), 중간의 NaN 구간과 드문드문 NaN
+    y[:30] = np.nan
+    y[1000:1400] = np.nan
+    y[rng.choice(5000, 100, replace=False)] = np.nan
+    selected = lttb(y, 200)
+    assert np.array_equal(selected, reference_lttb(y, 200))
+    edges = np.linspace(1, len(y) - 1, 199).astype(int)
+    valid_buckets = [
+        i for i in range(198) if not np.isnan(y[edges[i] : edges[i + 1]]).all()
+    ]
+    picks = selected[1:-1][valid_buckets]
+    assert not np.isnan(y[picks]).any()  # 값이 있는 버킷에서는 NaN을 고르지 않음
+    after_gap = [i for i in valid_buckets if edges[i] > 1400]
+    at_start = np.mean(selected[1:-1][after_gap] == edges[after_gap])
+    assert at_start < 0.2, at_start  # 버킷 첫 점으로만 채워지지 않음
+
+    # minmax: 값이 있는 버킷은 NaN이 아닌 최솟값, 최댓값 시점을 남김
+    selected = set(minmax_buckets(y, 200).tolist())
+    edges = np.linspace(0, len(y), 101).astype(int)
+    for start, stop in zip(edges[:-1], edges[1:]):
+        bucket = y[start:stop]
+        if np.isnan(bucket).all():
+            continue
+        chosen = {i for i in selected if start <= i < stop and i not in (0, len(y) - 1)}
+        assert not np.isnan(y[list(chosen)]).any()
+        assert {np.nanmin(bucket), np.nanmax(bucket)} <= set(y[list(chosen)])
+    print("다운샘플링 검사 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+- HistoricalPrice 증분 갱신(HistoricalPriceFullMeta.refresh) 검사
+- 저장된 마지막 관측값(장중 수집)이 확정값으로 바뀌어도 전체를 다시 수집하지 않고
+    증분 갱신하며, 갱신 결과가 전체를 다시 보간한 결과와 같은지 확인합니다.
+- 마지막 이전의 과거 데이터가 바뀌면 전체를 다시 수집(None)해야 합니다.
+- FMP API 대신 응답을 지정할 수 있는 가짜 클라이언트를 사용합니다.
+- 사용 예시: sh script/run_test.sh script/test_price_refresh.py
+"""
+import copy
+import asyncio
+from datetime import date, timedelta
+
+import numpy as np
+import xarray as xr
+
+from backend.calc import interpolation
+from backend.data.fmp import data_metaclass
+from backend.data.fmp.integrate import HistoricalPrice
+
+
+class FakeFmpAPI:
+    """historical-price-full 응답에서 from 이후의 레코드만 돌려줍니다."""
+
+    records = []
+
+    def __init__(self, cache: bool = True):
+        pass
+
+    async def get(self, path: str, **params):
+        since = params.get("from", "1900-01-01")
+        return {"historical": [r for r in self.records if r["date"] >= since]}
+
+
+data_metaclass.FmpAPI = FakeFmpAPI
+
+
+def synthesize(days: int) -> list:
+    """평일마다 관측값이 있는 historical-price-full 레코드 (최신 날짜가 앞)"""
+    rng = np.random.default_rng(0)
+    start = date(2023, 1, 2)
+    records = []
+    for i in range(days):
+        day = start + timedelta(days=i)
+        if day.weekday() < 5:
+            price = float(100 + rng.normal(0, 1))
+            records.append({"date": str(day), "adjClose": price, "volume": 1e6 + i})
+    return records[::-1]
+
+
+def store(client, records: list) -> dict:
+    """수집한 레코드를 저장소와 같은 형식(펙터별 daily, mask)으로 만듭니다."""
+    return {
+        factor: interpolation(data_array.dropna(dim="t"))
+        for factor, data_array in client.parse(records).items()
+        if data_array.notnull().sum() >= 2
+    }
+
+
+def apply(stored: dict, windows: dict) -> dict:
+    """xr_update_zarr처럼 t축 start 위치부터 window로 교체합니다."""
+    result = {}
+    for factor, ds in stored.items():
+        window, start = windows[factor]
+        if start is None:
+            result[factor] = ds
+            continue
+        head = ds.isel(t=slice(0, start))
+        result[factor] = xr.concat([head, window], dim="t", combine_attrs="override")
+        result[factor].attrs = window.attrs
+    return result
+
+
+async def main():
+    client = HistoricalPrice("TEST")
+    history = synthesize(400)
+    stored = store(client, history)
+
+    # 마지막 관측값(장중)이 확정값으로 바뀌고 새로운 이틀치 관측값이 추가됨
+    revised = copy.deepcopy(history)
+    revised[0]["adjClose"] += 0.37
+    revised[0]["volume"] += 12345
+    last = date.fromisoformat(revised[0]["date"])
+    for i, day in enumerate([last + timedelta(days=3), last + timedelta(days=4)]):
+        revised.insert(0, {"date": str(day), "adjClose": 101.0 + i, "volume": 2e6})
+    FakeFmpAPI.records = revised
+    windows = await client.refresh(stored)
+    assert windows is not None, "마지막 관측값이 바뀌었다고 전체를 다시 수집함"
+    expected, result = store(client, revised), apply(stored, windows)
+    for factor, ds in expected.items():
+        assert np.array_equal(ds.t.values, result[factor].t.values)
+        assert np.array_equal(ds.mask.values, result[factor].mask.values)
+        assert np.allclose(ds.daily.values, result[factor].daily.values)
+        ratio = lambda d: d.attrs["normalize"]["interpolation"]["ratio"]
+        assert np.isclose(ratio(ds), ratio(result[factor]))
+
+    # 새로운 데이터 없이 마지막 관측값만 바뀌어도 덮어씀
+    FakeFmpAPI.records = revised[2:]
+    windows = await client.refresh(stored)
+    assert windows is not None and windows["adjClose"][1] is not None
+    result = apply(stored, windows)
+    assert np.isclose(result["adjClose"].daily.values[-1], revised[2]["adjClose"])
+
+    # 마지막 이전의 과거 값이 바뀌면 전체를 다시 수집
+    changed = copy.deepcopy(history)
+    changed[3]["adjClose"] += 1
+    FakeFmpAPI.records = changed
+    assert await client.refresh(stored) is None
+    print("HistoricalPrice 증분 갱신 검사 통과")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
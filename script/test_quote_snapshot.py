@@ -0,0 +1,60 @@
+"""
+- QuoteSnapshot 캐시 검사
+- quote 요청이 실패하거나 응답에 symbol이 빠졌을 때
+    - 만료된 이전 시세를 현재 시세처럼 제공하지 않고 빈 레코드를 반환하는지
+    - 빈 레코드도 ttl 동안 유지해서 매번 다시 요청하지 않는지 확인합니다.
+- FMP API 대신 응답을 지정할 수 있는 가짜 클라이언트를 사용합니다.
+- 사용 예시: sh script/run_test.sh script/test_quote_snapshot.py
+"""
+import time
+import asyncio
+
+from backend.data.fmp import integrate
+from backend.data.fmp.integrate import QuoteSnapshot
+
+
+class FakeFmpAPI:
+    """api/v3/quote 응답을 responses에서 꺼내 주고 요청 횟수를 셉니다."""
+
+    responses = []
+    requests = 0
+
+    def __init__(self, cache: bool = True):
+        pass
+
+    async def get(self, path: str):
+        FakeFmpAPI.requests += 1
+        return FakeFmpAPI.responses.pop(0)
+
+
+integrate.FmpAPI = FakeFmpAPI
+QuoteSnapshot.ttl = 0.2
+
+
+async def main():
+    aapl = {"symbol": "AAPL", "price": 190.0}
+    msft = {"symbol": "MSFT", "price": 370.0}
+    FakeFmpAPI.responses = [[aapl, msft]]
+    quotes = await QuoteSnapshot.get_many(["AAPL", "MSFT"])
+    assert quotes == {"AAPL": aapl, "MSFT": msft}
+    assert await QuoteSnapshot.get("AAPL") == aapl  # ttl 동안 다시 요청하지 않음
+    assert FakeFmpAPI.requests == 1
+
+    time.sleep(QuoteSnapshot.ttl)
+    # 요청 실패(None)
+    FakeFmpAPI.responses = [None]
+    assert await QuoteSnapshot.get_many(["AAPL", "MSFT"]) == {"AAPL": {}, "MSFT": {}}
+    assert await QuoteSnapshot.get("AAPL") == {}  # 빈 레코드도 ttl 동안 유지
+    assert FakeFmpAPI.requests == 2
+
+    time.sleep(QuoteSnapshot.ttl)
+    # 응답에 일부 symbol이 빠짐
+    FakeFmpAPI.responses = [[aapl]]
+    assert await QuoteSnapshot.get_many(["AAPL", "MSFT"]) == {"AAPL": aapl, "MSFT": {}}
+    assert await QuoteSnapshot.get("MSFT") == {}
+    assert FakeFmpAPI.requests == 3
+    print("QuoteSnapshot 검사 통과")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+"""
+- RefreshLock 검사
+- 운영 환경과 같이 connection_pool을 넘긴 클라이언트(응답을 디코딩하지 않아 bytes 반환)로
+    잠금 획득, 보유 확인(held), 해제, lease 만료 후 다른 워커의 획득을 확인합니다.
+    - held가 항상 False면 data_metaclass의 저장소 쓰기가 모두 막힙니다.
+- 사용 예시: sh script/run_test.sh script/test_refresh_lock.py
+"""
+import asyncio
+
+import redis.asyncio as redis
+
+from backend.data.freshness import RefreshLock
+
+# system.REDIS_CONFIG와 같은 형태 (풀을 넘기면 decode_responses는 적용되지 않음)
+pool = redis.ConnectionPool(host="localhost")
+RefreshLock.cache = redis.Redis(connection_pool=pool, decode_responses=True)
+RefreshLock.lease = 1
+
+
+async def main():
+    await RefreshLock.cache.set("refresh-lock:probe", "1")
+    assert isinstance(await RefreshLock.cache.get("refresh-lock:probe"), bytes)
+    await RefreshLock.cache.delete("refresh-lock:probe")
+
+    async with RefreshLock("TEST", "HistoricalPrice") as lock:
+        assert lock.acquired and lock.token is not None
+        assert await lock.held()
+        async with RefreshLock("TEST", "HistoricalPrice") as other:
+            assert not other.acquired
+            assert not await other.held()
+    # 해제된 뒤에는 다른 워커가 잠금을 잡을 수 있음
+    async with RefreshLock("TEST", "HistoricalPrice") as lock:
+        assert lock.acquired and await lock.held()
+        await asyncio.sleep(RefreshLock.lease + 0.5)  # lease 만료
+        assert not await lock.held()
+        async with RefreshLock("TEST", "HistoricalPrice") as other:
+            assert other.acquired and await other.held()
+            assert not await lock.held()  # 만료된 잠금으로는 쓰지 않음
+        # 만료된 잠금의 해제가 다른 워커의 잠금을 풀지 않음
+    print("RefreshLock 검사 통과")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())